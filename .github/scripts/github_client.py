@@ -0,0 +1,35 @@
+"""Shared GitHub client construction, so every handler in a process reuses one authenticated session"""
+
+from functools import lru_cache
+from github import Github
+
+# PyGithub defaults to 30 items per page; 100 is the most GitHub returns
+PER_PAGE = 100
+
+# Connections kept open per client, enough for repo_configuration_management's repository workers times its
+# collaborator workers; urllib3 otherwise keeps 10 and discards the rest after every request
+POOL_SIZE = 32
+
+
+@lru_cache(maxsize=None)
+def get_github(github_token, lazy=False):
+    """
+    Get the shared GitHub client for a token
+
+    :param github_token: GitHub Personal Access Token
+    :param lazy: Only fetch objects obtained through the client when their attributes are read
+    :return: Github instance
+    """
+    return Github(github_token, per_page=PER_PAGE, pool_size=POOL_SIZE, lazy=lazy)
+
+
+@lru_cache(maxsize=None)
+def get_organization(github_token, org_name):
+    """
+    Get the shared organization object for a token and organization name
+
+    :param github_token: GitHub Personal Access Token
+    :param org_name: GitHub Organization Name
+    :return: Organization instance, fetched only once one of its attributes is read
+    """
+    return get_github(github_token, lazy=True).get_organization(org_name)
@@ -1,235 +1,509 @@
 import os
 import re
-from typing import Dict, List, Optional
+import json
+import fnmatch
+import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import yaml
 from github import Github
 from github.GithubException import GithubException
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Debug output is opt-in, following the runner's debug logging setting
+logging.basicConfig(
+    level=logging.DEBUG if os.environ.get("RUNNER_DEBUG") == "1" else logging.INFO, format="%(message)s"
+)
+logger = logging.getLogger(__name__)
+
+STATUS_CONTEXT = "pr-review-requirements"
+
+# Upper bound on concurrent writes, keeping bursts under GitHub's secondary rate limit
+MAX_WRITE_WORKERS = 8
+
+# Everything process_pull_request needs to read, fetched in a single GraphQL round trip.
+# The organization block is only appended when there are team memberships to resolve.
+PULL_REQUEST_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $withReviews: Boolean!, $statusContext: String!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      id
+      baseRefName
+      headRefOid
+      author { login }
+      commits(last: 1) {
+        nodes { commit { status { context(name: $statusContext) { state description } } } }
+      }
+      latestOpinionatedReviews(first: 100) @include(if: $withReviews) {
+        pageInfo { hasNextPage endCursor }
+        nodes { state author { login } }
+      }
+    }
+  }%s
+}
+"""
+
+# Further reviewers, only fetched while the first page has not satisfied the requirements
+REVIEWS_PAGE_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $after: String!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      latestOpinionatedReviews(first: 100, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { state author { login } }
+      }
+    }
+  }
+}
+"""
+
+TEAM_MEMBERS_FRAGMENT = """
+  organization(login: %s) {%s
+  }"""
+
+TEAM_ALIAS_FRAGMENT = """
+    t%d: team(slug: %s) {
+      slug
+      members(first: 100) { pageInfo { hasNextPage endCursor } nodes { login id } }
+    }"""
+
+# Further members of a team with more than one page of them
+TEAM_MEMBERS_PAGE_QUERY = """
+query($org: String!, $slug: String!, $after: String!) {
+  organization(login: $org) {
+    team(slug: $slug) {
+      members(first: 100, after: $after) { pageInfo { hasNextPage endCursor } nodes { login id } }
+    }
+  }
+}
+"""
+
+# GitHub allows at most this many assignees on an issue or pull request
+MAX_ASSIGNEES = 10
+
+# Assigns the team members in one mutation instead of one REST call per batch of logins
+ADD_ASSIGNEES_MUTATION = """
+mutation($assignableId: ID!, $assigneeIds: [ID!]!) {
+  addAssigneesToAssignable(input: { assignableId: $assignableId, assigneeIds: $assigneeIds }) {
+    clientMutationId
+  }
+}
+"""
+
 
 class PRReviewManager:
     def __init__(self, github_token: str, repository: str, pr_number: int):
         """Initialize the PR Review Manager."""
-        self.gh = Github(github_token)
+        self.gh = Github(github_token, per_page=100)
         self.repo = self.gh.get_repo(repository)
         self.pr_number = pr_number
+        self._team_name = os.environ.get("TEAM_NAME", "")
         self.pr = self.repo.get_pull(pr_number)
         self.config = self._load_config()
         self.org = self.repo.organization
+        self._branch_configs, self._branch_patterns = self._compile_branch_patterns()
+        # Unbounded, since a manager handles a single pull request: these hold at most the PR's base branch
+        # and the teams named in REVIEWERS.yml, and are dropped with the manager at the end of the run
+        self._branch_config_cache: Dict[str, Optional[Dict]] = {}
+        self._slug_cache: Dict[str, str] = {}
+        # Team slug -> member logins, shared by the required team checks and assignee lookups
+        self._team_to_members: Dict[str, Set[str]] = {}
+        # Member login -> GraphQL node ID, needed to assign members through the GraphQL API
+        self._user_ids: Dict[str, str] = {}
 
     def _load_config(self) -> Dict:
         """Load the REVIEWERS.yml configuration file from PR's head branch."""
         try:
             # Get the PR's head branch ref and sha
             head_sha = self.pr.head.sha
-            print(
-                f"Debug: Looking for REVIEWERS.yml in PR #{self.pr_number} head branch: {self.pr.head.ref} (SHA: {head_sha})"
+            logger.debug(
+                "Looking for REVIEWERS.yml in PR #%s head branch: %s (SHA: %s)",
+                self.pr_number,
+                self.pr.head.ref,
+                head_sha,
             )
 
             try:
-                # Try to get the file from the PR's head branch
-                config_file = self.repo.get_contents("REVIEWERS.yml", ref=self.pr.head.ref)
-                print(f"Debug: Found REVIEWERS.yml in PR head branch {self.pr.head.ref}")
-            except Exception as e:
-                print(f"Debug: Could not find REVIEWERS.yml in PR head branch: {str(e)}")
+                # Fetch the single file directly from the PR's head branch
+                config = self._fetch_config(self.pr.head.ref)
+                logger.debug("Found REVIEWERS.yml in PR head branch %s", self.pr.head.ref)
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                logger.debug("Could not find REVIEWERS.yml in PR head branch: %s", e)
                 # Fallback to try getting from the base branch
-                config_file = self.repo.get_contents("REVIEWERS.yml", ref=self.pr.base.ref)
-                print(f"Debug: Found REVIEWERS.yml in base branch {self.pr.base.ref}")
-
-            content = config_file.decoded_content
-            if not content:
-                raise ValueError("REVIEWERS.yml is empty")
-
-            print(f"Debug: Successfully loaded REVIEWERS.yml, size: {len(content)} bytes")
+                config = self._fetch_config(self.pr.base.ref)
+                logger.debug("Found REVIEWERS.yml in base branch %s", self.pr.base.ref)
 
-            config = yaml.safe_load(content.decode("utf-8"))
             if not config:
                 raise ValueError("REVIEWERS.yml contains no valid configuration")
 
-            print("Debug: Successfully parsed YAML configuration")
             return config
 
         except yaml.YAMLError as e:
-            print(f"Debug: YAML parsing error - {str(e)}")
+            logger.debug("YAML parsing error - %s", e)
             raise ValueError(f"Failed to parse REVIEWERS.yml: {str(e)}") from e
         except Exception as e:
-            print(f"Debug: Unexpected error while loading config - {str(e)}")
+            logger.debug("Unexpected error while loading config - %s", e)
             raise FileNotFoundError(f"Failed to load REVIEWERS.yml: {str(e)}") from e
 
-    def _get_branch_config(self, branch_name: str) -> Optional[Dict]:
-        """Get the configuration for a specific branch."""
+    def _fetch_config(self, ref: str) -> Dict:
+        """Fetch and parse REVIEWERS.yml at ref."""
+        # Ask for the raw file so the body is the YAML itself rather than base64 inside a JSON envelope
+        status, response_headers, content = self.gh._Github__requester.requestJson(
+            "GET",
+            f"{self.repo.url}/contents/REVIEWERS.yml",
+            parameters={"ref": ref},
+            headers={"Accept": "application/vnd.github.raw+json"},
+        )
+        if status >= 400:
+            raise GithubException(status, content, response_headers)
+
+        if not content:
+            raise ValueError("REVIEWERS.yml is empty")
+        logger.debug("Successfully loaded REVIEWERS.yml, size: %d characters", len(content))
+
+        config = yaml.load(content, Loader=_YamlLoader)
+        logger.debug("Successfully parsed YAML configuration")
+        return config
+
+    def _compile_branch_patterns(self) -> Tuple[Dict, List]:
+        """Split the branch configurations into exact names and precompiled wildcard patterns."""
         try:
             branch_configs = self.config["pull_requests"]["branches"]
+        except (KeyError, TypeError) as e:
+            logger.debug("Missing key in configuration: %s", e)
+            return {}, []
+
+        patterns = [
+            (self._branch_matcher(pattern), pattern, config, set(config.get("exclude", [])))
+            for pattern, config in branch_configs.items()
+            if "*" in pattern
+        ]
+        return branch_configs, patterns
+
+    @staticmethod
+    def _branch_matcher(pattern: str) -> Callable[[str], bool]:
+        """Build a predicate for a wildcard pattern, using plain string checks for a single leading or trailing *."""
+        if pattern.count("*") == 1 and not any(char in pattern for char in "?["):
+            if pattern.endswith("*"):
+                prefix = pattern[:-1]
+                return lambda branch_name: branch_name.startswith(prefix)
+            if pattern.startswith("*"):
+                suffix = pattern[1:]
+                return lambda branch_name: branch_name.endswith(suffix)
+        return re.compile(fnmatch.translate(pattern)).match
 
+    def _get_branch_config(self, branch_name: str) -> Optional[Dict]:
+        """Get the configuration for a specific branch."""
+        if branch_name not in self._branch_config_cache:
+            self._branch_config_cache[branch_name] = self._match_branch_config(branch_name)
+        return self._branch_config_cache[branch_name]
+
+    def _match_branch_config(self, branch_name: str) -> Optional[Dict]:
+        """Resolve a branch name against the exact and wildcard branch configurations."""
+        try:
             # First check for exact match
-            if branch_name in branch_configs:
-                print(f"Debug: Found exact match configuration for branch {branch_name}")
-                return branch_configs[branch_name]
+            if branch_name in self._branch_configs:
+                logger.debug("Found exact match configuration for branch %s", branch_name)
+                return self._branch_configs[branch_name]
 
             # Then check pattern matches
-            for pattern, config in branch_configs.items():
-                if "*" in pattern:
-                    regex_pattern = pattern.replace("*", ".*")
-                    if re.match(regex_pattern, branch_name):
-                        # Check if branch is excluded
-                        if "exclude" in config and branch_name in config["exclude"]:
-                            print(f"Debug: Branch {branch_name} is excluded from pattern {pattern}")
-                            continue
-                        print(
-                            f"Debug: Found pattern match configuration for branch {branch_name} using pattern {pattern}"
-                        )
-                        return config
-
-            print(f"Debug: No matching configuration found for branch {branch_name}")
-            return None
+            for matches, pattern, config, excluded in self._branch_patterns:
+                if matches(branch_name):
+                    # Check if branch is excluded
+                    if branch_name in excluded:
+                        logger.debug("Branch %s is excluded from pattern %s", branch_name, pattern)
+                        continue
+                    logger.debug(
+                        "Found pattern match configuration for branch %s using pattern %s", branch_name, pattern
+                    )
+                    return config
 
-        except KeyError as e:
-            print(f"Debug: Missing key in configuration: {str(e)}")
+            logger.debug("No matching configuration found for branch %s", branch_name)
             return None
+
         except Exception as e:
-            print(f"Debug: Error getting branch configuration: {str(e)}")
+            logger.debug("Error getting branch configuration: %s", e)
             return None
 
+    def _remember_team_members(self, team_members: Dict[str, Set[str]]):
+        """Add freshly fetched memberships to the membership map for the rest of this run."""
+        self._team_to_members.update(team_members)
+
+    def _resolve_slug(self, team: str) -> str:
+        """Substitute the team name into a configured team and convert it to a GitHub team slug."""
+        if team not in self._slug_cache:
+            self._slug_cache[team] = team.replace("{{ team_name }}", self._team_name).lower().strip().replace(" ", "-")
+        return self._slug_cache[team]
+
     def _get_team_members(self, team_slug: str, org) -> List[str]:
         """Get list of usernames for members of a team."""
-        try:
-            team = org.get_team_by_slug(team_slug)
-            members = list(team.get_members())
-            print(f"team found: {team} from {team_slug}")
-            if not members:
-                print(f"Warning: No members found in team {team_slug}")
-                return []
-            return [member.login for member in members]
-        except GithubException as e:
-            if e.status == 404:
-                print(f"Warning: Team {team_slug} not found")
-                return []
-            print(f"Warning: Error accessing team {team_slug}: {str(e)}")
-            return []
-        except Exception as e:
-            print(f"Warning: Unexpected error getting team members for {team_slug}: {str(e)}")
-            return []
+        return self._get_many_team_members([team_slug], org)[team_slug]
 
-    def _check_required_reviews(self, pr, branch_config: Dict) -> bool:
+    def _get_many_team_members(self, team_slugs: List[str], org) -> Dict[str, List[str]]:
+        """Get the members of several teams, querying only the teams not already in the membership map."""
+        missing = [slug for slug in team_slugs if slug not in self._team_to_members]
+        if missing:
+            try:
+                data = self._graphql("query {%s\n}" % self._team_members_query(missing, org), {})
+                self._remember_team_members(self._parse_team_members(data, missing, org))
+            except GithubException as e:
+                logger.warning("Error accessing teams %s: %s", ", ".join(missing), e)
+                return {slug: sorted(self._team_to_members.get(slug, set())) for slug in team_slugs}
+
+        team_members = {}
+        for slug in team_slugs:
+            if not self._team_to_members[slug]:
+                logger.warning("No members found in team %s", slug)
+            team_members[slug] = sorted(self._team_to_members[slug])
+        return team_members
+
+    def _team_members_query(self, team_slugs: List[str], org) -> str:
+        """Build the organization block that aliases one team lookup per slug."""
+        aliases = "".join(TEAM_ALIAS_FRAGMENT % (i, json.dumps(slug)) for i, slug in enumerate(team_slugs))
+        return TEAM_MEMBERS_FRAGMENT % (json.dumps(org.login), aliases)
+
+    def _parse_team_members(self, data: Dict, team_slugs: List[str], org) -> Dict[str, Set[str]]:
+        """Map each slug to the member logins returned for its alias, paging through larger teams."""
+        team_members: Dict[str, Set[str]] = {}
+        for i, slug in enumerate(team_slugs):
+            team = (data.get("organization") or {}).get(f"t{i}")
+            if not team:
+                logger.warning("Team %s not found", slug)
+                team_members[slug] = set()
+                continue
+            members = team["members"]
+            team_members[slug] = set()
+            while True:
+                team_members[slug].update(member["login"] for member in members["nodes"])
+                self._user_ids.update((member["login"], member["id"]) for member in members["nodes"])
+                if not members["pageInfo"]["hasNextPage"]:
+                    break
+                page = self._graphql(
+                    TEAM_MEMBERS_PAGE_QUERY, {"org": org.login, "slug": slug, "after": members["pageInfo"]["endCursor"]}
+                )
+                members = page["organization"]["team"]["members"]
+        return team_members
+
+    def _graphql(self, query: str, variables: Dict) -> Dict:
+        """Run a GraphQL query through the authenticated PyGithub requester."""
+        _, response = self.gh._Github__requester.requestJsonAndCheck(
+            "POST", "/graphql", input={"query": query, "variables": variables}
+        )
+        if response.get("data") is None:
+            raise GithubException(400, response, None)
+        for error in response.get("errors", []):
+            logger.warning("GraphQL error - %s", error.get("message"))
+        return response["data"]
+
+    def _get_pull_request_context(self, pr_number: int, org, team_slugs: List[str], with_reviews: bool = True) -> Dict:
+        """Fetch the PR, its reviews, head SHA and any unknown teams' members in one GraphQL query."""
+        owner, name = self.repo.full_name.split("/", 1)
+        team_slugs = [slug for slug in dict.fromkeys(team_slugs) if slug not in self._team_to_members]
+        teams_query = self._team_members_query(team_slugs, org) if team_slugs else ""
+
+        data = self._graphql(
+            PULL_REQUEST_QUERY % teams_query,
+            {
+                "owner": owner,
+                "name": name,
+                "number": pr_number,
+                "withReviews": with_reviews,
+                "statusContext": STATUS_CONTEXT,
+            },
+        )
+        pull_request = data["repository"]["pullRequest"]
+        self._remember_team_members(self._parse_team_members(data, team_slugs, org))
+        head_commits = pull_request["commits"]["nodes"]
+        head_status = (head_commits[0]["commit"]["status"] or {}) if head_commits else {}
+
+        context = {
+            "pr_number": pr_number,
+            "node_id": pull_request["id"],
+            "base_ref": pull_request["baseRefName"],
+            "head_sha": pull_request["headRefOid"],
+            "author": (pull_request["author"] or {}).get("login"),
+            "review_states": {},
+            "reviews_cursor": None,
+            "status": head_status.get("context"),
+        }
+        if pull_request.get("latestOpinionatedReviews"):
+            self._record_reviews(context, pull_request["latestOpinionatedReviews"])
+
+        logger.debug(
+            "Fetched PR #%s context with %d reviewers and %d new teams",
+            pr_number,
+            len(context["review_states"]),
+            len(team_slugs),
+        )
+        return context
+
+    def _record_reviews(self, context: Dict, reviews: Dict):
+        """Record a page of reviews; GitHub already returns only each reviewer's latest opinionated review."""
+        for review in reviews["nodes"]:
+            login = (review["author"] or {}).get("login")
+            if login:
+                context["review_states"][login] = review["state"]
+
+        page_info = reviews["pageInfo"]
+        context["reviews_cursor"] = page_info["endCursor"] if page_info["hasNextPage"] else None
+
+    def _fetch_more_reviews(self, context: Dict):
+        """Fetch the next page of reviewers into the context."""
+        owner, name = self.repo.full_name.split("/", 1)
+        data = self._graphql(
+            REVIEWS_PAGE_QUERY,
+            {"owner": owner, "name": name, "number": context["pr_number"], "after": context["reviews_cursor"]},
+        )
+        self._record_reviews(context, data["repository"]["pullRequest"]["latestOpinionatedReviews"])
+
+    def _check_required_reviews(self, context: Dict, branch_config: Dict, required_teams: List[str]) -> bool:
         """Check if the PR has met the required review conditions."""
         try:
             required_approvals = branch_config.get("required_approvals", 0)
-            required_teams = branch_config.get("required_teams", [])
-
-            # Get all reviews
-            reviews = pr.get_reviews()
-            approved_reviews = {}
-
-            for review in reviews:
-                if review.state == "APPROVED":
-                    reviewer = review.user
-                    try:
-                        # Get user's teams in this repository
-                        user_teams = [team.name for team in reviewer.get_teams()]
-                        # Store the approval with the teams the reviewer belongs to
-                        approved_reviews[reviewer.login] = user_teams
-                    except GithubException as e:
-                        print(f"Warning: Could not get teams for user {reviewer.login}: {str(e)}")
-                        continue
+            if required_approvals == 0 and not required_teams:
+                return True
+
+            # Required team memberships were fetched with the PR, so team checks are local set lookups
+            team_to_members = {team: self._team_to_members.get(team, set()) for team in required_teams}
+
+            # Only page through further reviewers while requirements are unmet
+            while True:
+                approvers = {login for login, state in context["review_states"].items() if state == "APPROVED"}
+                # Stop at the first required team without an approving member
+                if len(approvers) >= required_approvals and all(
+                    not members.isdisjoint(approvers) for members in team_to_members.values()
+                ):
+                    return True
+                if not context["reviews_cursor"]:
+                    break
+                self._fetch_more_reviews(context)
 
             # Check number of approvals
-            if len(approved_reviews) < required_approvals:
-                print(f"Debug: Not enough approvals. Got {len(approved_reviews)}, need {required_approvals}")
-                return False
-
-            # Check required teams
-            if required_teams:
-                approved_teams = set()
-                for user_teams in approved_reviews.values():
-                    approved_teams.update(user_teams)
-
-                if not all(team in approved_teams for team in required_teams):
-                    missing_teams = set(required_teams) - approved_teams
-                    print(f"Debug: Missing required team approvals from: {missing_teams}")
-                    return False
-
-            return True
+            if len(approvers) < required_approvals:
+                logger.debug("Not enough approvals. Got %d, need %d", len(approvers), required_approvals)
+            if logger.isEnabledFor(logging.DEBUG):
+                missing_teams = {team for team, members in team_to_members.items() if members.isdisjoint(approvers)}
+                if missing_teams:
+                    logger.debug("Missing required team approvals from: %s", missing_teams)
+            return False
 
         except Exception as e:
-            print(f"Warning: Error checking required reviews: {str(e)}")
+            logger.warning("Error checking required reviews: %s", e)
             return False
 
+    def _create_status(self, sha: str, state: str, description: str):
+        """Set the review requirements commit status on the PR head."""
+        self.repo.get_commit(sha).create_status(
+            state=state, target_url="", description=description, context=STATUS_CONTEXT
+        )
+
+    def _add_assignees(self, assignable_id: str, logins: List[str]):
+        """Assign the given users to the PR with a single GraphQL mutation."""
+        data = self._graphql(
+            ADD_ASSIGNEES_MUTATION,
+            {"assignableId": assignable_id, "assigneeIds": [self._user_ids[login] for login in logins]},
+        )
+        if data.get("addAssigneesToAssignable") is None:
+            raise GithubException(422, data, None)
+
+    def _run_writes(self, writes: List):
+        """Issue independent GitHub mutations concurrently, reporting each failure without aborting the rest."""
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            futures = {executor.submit(write): action for action, write in writes}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    logger.info("Successfully completed: %s", futures[future])
+                except GithubException as e:
+                    logger.warning("Could not %s: %s", futures[future], e)
+
     def process_pull_request(self, pr_number: int, org):
         """Process a pull request according to the configuration."""
-        pr = self.repo.get_pull(pr_number)
+        pr = self.pr if pr_number == self.pr_number else self.repo.get_pull(pr_number)
         branch_name = pr.base.ref
-        print(f"Debug: Processing PR #{pr_number} targeting branch {branch_name}")
+        logger.debug("Processing PR #%s targeting branch %s", pr_number, branch_name)
 
         branch_config = self._get_branch_config(branch_name)
         if not branch_config:
-            print(f"No configuration found for branch: {branch_name}")
+            logger.info("No configuration found for branch: %s", branch_name)
             return
 
         # Assign reviewers and assignees
-        review_teams = branch_config.get("review_teams", [])
-        assignee_teams = branch_config.get("assignees", [])
+        # Dedupe after slugifying so a team listed twice is only requested and looked up once
+        review_teams = list(dict.fromkeys(self._resolve_slug(team) for team in branch_config.get("review_teams", [])))
+        assignee_slugs = list(dict.fromkeys(self._resolve_slug(team) for team in branch_config.get("assignees", [])))
+        required_teams = list(
+            dict.fromkeys(self._resolve_slug(team) for team in branch_config.get("required_teams", []))
+        )
 
         try:
-            # Add review teams using team slugs
-            for team in review_teams:
-                team_slug = (
-                    team.replace("{{ team_name }}", os.environ.get("TEAM_NAME", "")).lower().strip().replace(" ", "-")
+            # Read the PR reviews, head SHA and the required and assignee team memberships in one request,
+            # leaving the reviews out entirely when the branch has no review requirements
+            with_reviews = bool(branch_config.get("required_approvals", 0) or required_teams)
+            context = self._get_pull_request_context(pr_number, org, required_teams + assignee_slugs, with_reviews)
+
+            # Collect the independent writes so they can be issued concurrently
+            writes = []
+            for team_slug in review_teams:
+                writes.append(
+                    (
+                        f"request review from team {team_slug}",
+                        partial(pr.create_review_request, team_reviewers=[team_slug]),
+                    )
                 )
-                try:
-                    pr.create_review_request(team_reviewers=[team_slug])
-                    print(f"Successfully requested review from team: {team_slug}")
-                except GithubException as e:
-                    print(f"Warning: Could not request review from team {team_slug}: {str(e)}")
-                    continue
 
-            # Add assignees from teams
+            # Add assignees from teams, resolved from the membership map filled above
             assignees = set()
-            for team in assignee_teams:
-                team_slug = (
-                    team.replace("{{ team_name }}", os.environ.get("TEAM_NAME", "")).lower().strip().replace(" ", "-")
-                )
-                team_members = self._get_team_members(team_slug, org)
+            for team_slug, team_members in self._get_many_team_members(assignee_slugs, org).items():
                 if team_members:
                     assignees.update(team_members)
-                    print(f"Found {len(team_members)} members in team {team_slug}")
+                    logger.info("Found %d members in team %s", len(team_members), team_slug)
 
-            # Only proceed if there are assignees to add
+            # Add the assignees with one mutation rather than a REST call per batch
             if assignees:
-                try:
-                    # Add assignees in batches to handle GitHub's limitation
-                    assignees_list = list(assignees)
-                    for i in range(0, len(assignees_list), 10):
-                        batch = assignees_list[i : i + 10]
-                        pr.add_to_assignees(*batch)
-                        print(f"Successfully added assignees: {', '.join(batch)}")
-                except GithubException as e:
-                    print(f"Warning: Error adding assignees: {str(e)}")
+                assignees_list = sorted(assignees)
+                if len(assignees_list) > MAX_ASSIGNEES:
+                    logger.warning(
+                        "Only the first %d of %d team members can be assigned; skipping %s",
+                        MAX_ASSIGNEES,
+                        len(assignees_list),
+                        ", ".join(assignees_list[MAX_ASSIGNEES:]),
+                    )
+                    assignees_list = assignees_list[:MAX_ASSIGNEES]
+                writes.append(
+                    (
+                        f"add assignees {', '.join(assignees_list)}",
+                        partial(self._add_assignees, context["node_id"], assignees_list),
+                    )
+                )
             else:
-                print("No valid assignees found to add to the PR")
+                logger.info("No valid assignees found to add to the PR")
 
-            # Check review requirements
-            meets_requirements = self._check_required_reviews(pr, branch_config)
+            # Check review requirements; only needs the context fetched above, so the status joins the batch
+            if self._check_required_reviews(context, branch_config, required_teams):
+                state, description = "success", "All review requirements met"
+            else:
+                state, description = "pending", "Required reviews not yet met"
+            # Skip the write when a previous run already left the same status on this commit
+            current_status = context["status"] or {}
+            if (current_status.get("state", "").lower(), current_status.get("description")) == (state, description):
+                logger.debug("Status check already %s on %s, skipping update", state, context["head_sha"])
+            else:
+                writes.append(
+                    ("update status check", partial(self._create_status, context["head_sha"], state, description))
+                )
 
-            status_context = "pr-review-requirements"
-            try:
-                if not meets_requirements:
-                    self.repo.get_commit(pr.head.sha).create_status(
-                        state="pending",
-                        target_url="",
-                        description="Required reviews not yet met",
-                        context=status_context,
-                    )
-                else:
-                    self.repo.get_commit(pr.head.sha).create_status(
-                        state="success",
-                        target_url="",
-                        description="All review requirements met",
-                        context=status_context,
-                    )
-            except GithubException as e:
-                print(f"Warning: Could not update status check: {str(e)}")
+            self._run_writes(writes)
 
         except Exception as e:
-            print(f"Error processing PR #{pr_number}: {str(e)}")
+            logger.error("Error processing PR #%s: %s", pr_number, e)
             raise
 
 
@@ -241,16 +515,19 @@ def main():
     org_name = os.environ["GITHUB_ORGANIZATION"]
 
     # Debug: Check repository access
-    gh = Github(github_token)
+    gh = Github(github_token, per_page=100)
     org = gh.get_organization(org_name)
     try:
         repo = gh.get_repo(repository)
-        print(f"Debug: Successfully accessed repository {repository}")
-        print(
-            f"Debug: Repository permissions - admin: {repo.permissions.admin}, push: {repo.permissions.push}, pull: {repo.permissions.pull}"
+        logger.debug("Successfully accessed repository %s", repository)
+        logger.debug(
+            "Repository permissions - admin: %s, push: %s, pull: %s",
+            repo.permissions.admin,
+            repo.permissions.push,
+            repo.permissions.pull,
         )
     except Exception as e:
-        print(f"Debug: Error accessing repository - {str(e)}")
+        logger.debug("Error accessing repository - %s", e)
 
     # Initialize and run the PR Review Manager
     manager = PRReviewManager(github_token, repository, pr_number)
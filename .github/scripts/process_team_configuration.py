@@ -6,6 +6,11 @@ import logging
 import re
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
@@ -13,7 +18,12 @@ logger = logging.getLogger(__name__)
 # Define the root teams file path
 ROOT_TEAMS_FILE = "teams.yml"
 
+# Every issue body field, matched in a single pass over the body
+ISSUE_FIELD_PATTERN = re.compile(r"(Team Name|Project|Description|Members|Repositories|Repository Permissions):\s*(.+)")
+
 
+# Kept on the pure Python emitter: libyaml's CSafeDumper never calls increase_indent,
+# so it would write sequences unindented and change the layout of teams.yml
 class IndentDumper(yaml.Dumper):
     """Format YAML output indents"""
 
@@ -34,24 +44,19 @@ def parse_issue_body(issue_body):
 
     team_config = {}
 
-    # Extract details
-    team_name_match = re.search(r"Team Name:\s*(.+)", issue_body)
-    team_config["team_name"] = team_name_match.group(1).strip() if team_name_match else None
-
-    project_match = re.search(r"Project:\s*(.+)", issue_body)
-    team_config["project"] = project_match.group(1).strip() if project_match else None
-
-    desc_match = re.search(r"Description:\s*(.+)", issue_body)
-    team_config["description"] = desc_match.group(1).strip() if desc_match else None
-
-    members_match = re.search(r"Members:\s*(.+)", issue_body)
-    team_config["members"] = [m.strip() for m in members_match.group(1).split(",")] if members_match else []
-
-    repos_match = re.search(r"Repositories:\s*(.+)", issue_body)
-    team_config["default_repositories"] = [r.strip() for r in repos_match.group(1).split(",")] if repos_match else []
+    # Extract details, keeping the first occurrence of each field
+    fields = {}
+    for field, value in ISSUE_FIELD_PATTERN.findall(issue_body):
+        fields.setdefault(field, value.strip())
 
-    perms_match = re.search(r"Repository Permissions:\s*(.+)", issue_body)
-    team_config["repository_permissions"] = perms_match.group(1).strip() if perms_match else "read"
+    team_config["team_name"] = fields.get("Team Name")
+    team_config["project"] = fields.get("Project")
+    team_config["description"] = fields.get("Description")
+    team_config["members"] = [m.strip() for m in fields["Members"].split(",")] if "Members" in fields else []
+    team_config["default_repositories"] = (
+        [r.strip() for r in fields["Repositories"].split(",")] if "Repositories" in fields else []
+    )
+    team_config["repository_permissions"] = fields.get("Repository Permissions", "read")
 
     return team_config
 
@@ -61,7 +66,7 @@ def update_teams_config(new_team_config, config_file=ROOT_TEAMS_FILE):
 
     # Read existing configuration
     with open(config_file, mode="r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
     # Ensure teams list exists
     if "teams" not in config:
         config["teams"] = []
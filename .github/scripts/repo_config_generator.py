@@ -1,19 +1,38 @@
-import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 import yaml
-from datetime import datetime
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
-def generate_repository_config(repo_details):
+
+@lru_cache(maxsize=None)
+def get_repositories_dir():
+    """
+    Get the repositories output directory, creating it on first use
+
+    :return: Path to the repositories directory
+    """
+    repositories_dir = Path.cwd() / "repositories"
+    repositories_dir.mkdir(exist_ok=True)
+    return repositories_dir
+
+
+def generate_repository_config(repo_details, timestamp=None):
     """
     Generate a comprehensive repository configuration file
 
     :param repo_details: Dictionary of repository details
+    :param timestamp: Creation timestamp to record, shared when generating a batch of configurations
     :return: Dictionary representing the repository configuration
     """
-    # Get current timestamp
-    timestamp = datetime.now().isoformat()
+    # Get current timestamp unless the caller computed one for the whole batch
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
 
-    # Base configuration template
+    # Base configuration template, built fresh on every call so callers can modify the result
     config = {
         # Metadata
         "metadata": {
@@ -55,27 +74,32 @@ def generate_repository_config(repo_details):
     return config
 
 
-def save_repository_config(repo_name, config):
+def serialize_repository_config(config):
+    """
+    Serialize repository configuration to YAML
+
+    :param config: Configuration dictionary
+    :return: YAML document as a string
+    """
+    return yaml.dump(config, Dumper=_YamlDumper, default_flow_style=False)
+
+
+def save_repository_config(repo_name, config, content=None):
     """
     Save repository configuration to a YAML file
 
     :param repo_name: Name of the repository
     :param config: Configuration dictionary
+    :param content: Already serialized configuration, to avoid dumping it twice when it is also committed elsewhere
     :return: Path to the saved configuration file
     """
-    # Ensure repositories directory exists
-    repositories_dir = os.path.join(os.getcwd(), "repositories")
-    os.makedirs(repositories_dir, exist_ok=True)
-
-    # Generate filename
-    config_filename = f"{repo_name}.yml"
-    config_path = os.path.join(repositories_dir, config_filename)
+    # Generate filename in the repositories directory
+    config_path = get_repositories_dir() / f"{repo_name}.yml"
 
-    # Write configuration file
-    with open(config_path, "w") as config_file:
-        yaml.dump(config, config_file, default_flow_style=False)
+    # Write the serialized configuration in a single call, so no write buffer is involved
+    config_path.write_text(content if content is not None else serialize_repository_config(config), encoding="utf-8")
 
-    return config_path
+    return str(config_path)
 
 
 def main():
@@ -1,8 +1,68 @@
 import os
-import yaml
 import json
+import hashlib
 import sys
-from github import Github
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import yaml
+from github.GithubException import GithubException
+from github_client import get_github, get_organization
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Repositories validated and updated at once, kept low enough to stay under GitHub's secondary rate limits
+MAX_WORKERS = 8
+
+# Collaborator additions and removals issued at once for a single repository
+COLLABORATOR_WORKERS = 4
+
+# Parsed repo_settings.yml files as JSON, keyed by blob SHA so identical files are parsed once across runs.
+# RUNNER_TEMP is emptied between jobs, so the workflow restores and saves this directory with actions/cache
+CONFIG_CACHE_DIR = os.path.join(os.environ.get("RUNNER_TEMP", tempfile.gettempdir()), "repo_config_cache")
+
+# Digest of each repository's listed settings when they last matched its config, so unchanged repositories are skipped
+REPOSITORY_STATE_FILE = os.path.join(CONFIG_CACHE_DIR, "repository_state.json")
+
+# One page of organization repositories with everything validate_repository_config compares,
+# replacing the per-repository contents, branch, protection and collaborator REST calls
+REPOSITORIES_QUERY = """
+query($org: String!, $cursor: String, $configExpression: String!) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        isPrivate
+        defaultBranchRef {
+          name
+          branchProtectionRule {
+            requiresStatusChecks
+            requiresStrictStatusChecks
+            requiredStatusCheckContexts
+            isAdminEnforced
+            requiresApprovingReviews
+            requiredApprovingReviewCount
+            dismissesStaleReviews
+            requiresCodeOwnerReviews
+          }
+        }
+        config: object(expression: $configExpression) {
+          ... on Blob { oid text }
+        }
+        collaborators(first: 100) {
+          pageInfo { hasNextPage }
+          nodes { login }
+        }
+      }
+    }
+  }
+}
+"""
 
 
 class RepositoryConfigManager:
@@ -13,25 +73,92 @@ class RepositoryConfigManager:
         :param github_token: GitHub Personal Access Token
         :param org_name: GitHub Organization Name
         """
-        self.g = Github(github_token)
-        self.org = self.g.get_organization(org_name)
+        self.g = get_github(github_token)
+        # Writes go through lazy objects, since the repository listing already holds their current state
+        self.lazy_g = get_github(github_token, lazy=True)
+        self.org = get_organization(github_token, org_name)
+        self.org_name = org_name
         self.config_filename = ".github/repo_settings.yml"
+        self._parsed_configs = {}
+        self._previous_state = self._load_repository_state()
+        self._repository_state = {}
+
+    def _graphql(self, query, variables):
+        """
+        Run a GraphQL query through the authenticated PyGithub requester
+
+        :param query: GraphQL query document
+        :param variables: Query variables
+        :return: The response data
+        """
+        _, response = self.g._Github__requester.requestJsonAndCheck(
+            "POST", "/graphql", input={"query": query, "variables": variables}
+        )
+        if response.get("data") is None:
+            raise GithubException(400, response, None)
+        for error in response.get("errors", []):
+            print(f"GraphQL error: {error.get('message')}")
+        return response["data"]
+
+    def _parse_config(self, blob):
+        """
+        Parse a repo_settings.yml blob, reusing earlier parses of the same blob SHA
+
+        :param blob: Blob dictionary with oid and text
+        :return: Parsed configuration
+        """
+        oid = blob["oid"]
+        if oid in self._parsed_configs:
+            return self._parsed_configs[oid]
+
+        cache_path = os.path.join(CONFIG_CACHE_DIR, f"{oid}.json")
+        try:
+            with open(cache_path, mode="r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            config = yaml.load(blob["text"], Loader=_YamlLoader)
+            try:
+                os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+                with open(cache_path, mode="w", encoding="utf-8") as f:
+                    json.dump(config, f)
+            except (OSError, TypeError) as e:
+                print(f"Could not cache parsed config {oid}: {e}")
+
+        self._parsed_configs[oid] = config
+        return config
+
+    def iter_repositories(self):
+        """
+        Iterate over the organization's repositories, fetched 100 at a time with their settings
+
+        :return: Generator of repository dictionaries as returned by REPOSITORIES_QUERY
+        """
+        cursor = None
+        while True:
+            data = self._graphql(
+                REPOSITORIES_QUERY,
+                {"org": self.org_name, "cursor": cursor, "configExpression": f"HEAD:{self.config_filename}"},
+            )
+            repositories = data["organization"]["repositories"]
+            yield from repositories["nodes"]
+
+            if not repositories["pageInfo"]["hasNextPage"]:
+                break
+            cursor = repositories["pageInfo"]["endCursor"]
 
     def validate_repository_config(self, repo):
         """
         Validate repository configuration against predefined settings
 
-        :param repo: GitHub Repository object
+        :param repo: Repository dictionary from iter_repositories
         :return: Dictionary of configuration changes
         """
         try:
-            # Try to get the config file
-            try:
-                config_content = repo.get_contents(self.config_filename)
-                config = yaml.safe_load(config_content.decoded_content)
-            except Exception:
+            # The config file is fetched with the repository listing
+            if not repo.get("config"):
                 # No config file found
                 return None
+            config = self._parse_config(repo["config"])
 
             changes = {}
 
@@ -40,30 +167,32 @@ class RepositoryConfigManager:
                 metadata = config["metadata"]
 
                 # Check repository name
-                if metadata.get("name") and metadata["name"] != repo.name:
+                if metadata.get("name") and metadata["name"] != repo["name"]:
                     changes["name"] = metadata["name"]
 
                 # Check description
-                if metadata.get("description") and metadata["description"] != repo.description:
+                if metadata.get("description") and metadata["description"] != repo["description"]:
                     changes["description"] = metadata["description"]
 
                 # Check visibility
-                if metadata.get("private") is not None and metadata["private"] != repo.private:
+                if metadata.get("private") is not None and metadata["private"] != repo["isPrivate"]:
                     changes["private"] = metadata["private"]
 
             # Validate branch protection
             if "branch_protection" in config:
                 branch_config = config["branch_protection"]
-                default_branch = repo.default_branch
+                current_protection = (repo["defaultBranchRef"] or {}).get("branchProtectionRule")
 
                 try:
-                    branch = repo.get_branch(default_branch)
-                    current_protection = branch.get_protection()
+                    if not current_protection:
+                        raise ValueError("default branch is not protected")
 
                     # Compare current protection with desired protection
                     protection_changes = self._compare_branch_protection(current_protection, branch_config)
 
                     if protection_changes:
+                        # Keep the current rule so the changes can be applied without fetching it again
+                        protection_changes["current"] = current_protection
                         changes["branch_protection"] = protection_changes
 
                 except Exception as e:
@@ -72,11 +201,20 @@ class RepositoryConfigManager:
 
             # Validate repository collaborators and teams
             if "collaborators" in config:
-                current_collaborators = [member.login for member in repo.get_collaborators()]
-                desired_collaborators = config["collaborators"]
+                # Null when the token cannot read the collaborators
+                collaborators = repo.get("collaborators") or {}
+                page_info = collaborators.get("pageInfo")
+                if not page_info or page_info["hasNextPage"]:
+                    # The listing did not return every collaborator, list them all through REST
+                    current_collaborators = frozenset(
+                        member.login for member in self.lazy_g.get_repo(repo["nameWithOwner"]).get_collaborators()
+                    )
+                else:
+                    current_collaborators = frozenset(member["login"] for member in collaborators["nodes"])
+                desired_collaborators = frozenset(config["collaborators"])
 
-                add_collaborators = set(desired_collaborators) - set(current_collaborators)
-                remove_collaborators = set(current_collaborators) - set(desired_collaborators)
+                add_collaborators = desired_collaborators - current_collaborators
+                remove_collaborators = current_collaborators - desired_collaborators
 
                 if add_collaborators or remove_collaborators:
                     changes["collaborators"] = {"add": list(add_collaborators), "remove": list(remove_collaborators)}
@@ -91,7 +229,7 @@ class RepositoryConfigManager:
         """
         Compare current branch protection with desired configuration
 
-        :param current_protection: Current branch protection settings
+        :param current_protection: Current branch protection rule from the repository listing
         :param desired_protection: Desired branch protection configuration
         :return: Dictionary of protection changes
         """
@@ -99,7 +237,7 @@ class RepositoryConfigManager:
 
         # Check required status checks
         if "required_status_checks" in desired_protection:
-            current_contexts = set(current_protection.required_status_checks.contexts)
+            current_contexts = set(current_protection["requiredStatusCheckContexts"])
             desired_contexts = set(desired_protection.get("required_status_checks", []))
 
             if current_contexts != desired_contexts:
@@ -110,18 +248,22 @@ class RepositoryConfigManager:
 
         # Check enforce admins
         if "enforce_admins" in desired_protection:
-            if current_protection.enforce_admins.enabled != desired_protection["enforce_admins"]:
+            if current_protection["isAdminEnforced"] != desired_protection["enforce_admins"]:
                 changes["enforce_admins"] = desired_protection["enforce_admins"]
 
         # Check required pull request reviews
         if "required_pull_request_reviews" in desired_protection:
             review_config = desired_protection["required_pull_request_reviews"]
-            current_reviews = current_protection.required_pull_request_reviews
+            current_review_count = (
+                current_protection["requiredApprovingReviewCount"]
+                if current_protection["requiresApprovingReviews"]
+                else None
+            )
 
             # Compare review requirements
             review_changes = {}
             if "required_approving_review_count" in review_config:
-                if current_reviews.required_approving_review_count != review_config["required_approving_review_count"]:
+                if current_review_count != review_config["required_approving_review_count"]:
                     review_changes["required_approving_review_count"] = review_config["required_approving_review_count"]
 
             if review_changes:
@@ -129,68 +271,157 @@ class RepositoryConfigManager:
 
         return changes
 
+    def _load_repository_state(self):
+        """
+        Load the repository digests recorded by the previous run
+
+        :return: Dictionary of repository full name to settings digest
+        """
+        try:
+            with open(REPOSITORY_STATE_FILE, mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_repository_state(self):
+        """
+        Persist the digests of repositories that are now in line with their configuration
+        """
+        temp_path = f"{REPOSITORY_STATE_FILE}.tmp"
+        try:
+            os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+            with open(temp_path, mode="w", encoding="utf-8") as f:
+                json.dump(self._repository_state, f)
+            # Replace in one step so an interrupted run never leaves a truncated state file
+            os.replace(temp_path, REPOSITORY_STATE_FILE)
+        except OSError as e:
+            print(f"Could not save repository state: {e}")
+
+    @staticmethod
+    def _repository_digest(repo):
+        """
+        Digest everything the listing returned for a repository, including its config blob SHA
+
+        :param repo: Repository dictionary from iter_repositories
+        :return: Hex digest of the repository settings
+        """
+        return hashlib.sha256(json.dumps(repo, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def process_repository(self, repo):
+        """
+        Validate a repository and apply any configuration changes it needs
+
+        :param repo: Repository dictionary from iter_repositories
+        """
+        name = repo["nameWithOwner"]
+        digest = self._repository_digest(repo)
+        if self._previous_state.get(name) == digest:
+            # Neither the repository settings nor its config changed since they last matched
+            self._repository_state[name] = digest
+            return
+
+        changes = self.validate_repository_config(repo)
+
+        if changes:
+            # Recorded once the next run lists the repository with the changes in place
+            print(f"Applying changes to repository: {name}")
+            self.apply_repository_changes(repo, changes)
+        else:
+            # Collaborators beyond the first page, or not listed at all, are not part of the digest,
+            # so those repositories are always checked
+            page_info = (repo.get("collaborators") or {}).get("pageInfo")
+            if page_info and not page_info["hasNextPage"]:
+                self._repository_state[name] = digest
+
     def apply_repository_changes(self, repo, changes):
         """
         Apply detected configuration changes to the repository
 
-        :param repo: GitHub Repository object
+        :param repo: Repository dictionary from iter_repositories
         :param changes: Dictionary of changes to apply
         """
         try:
+            # The listing already holds the current values, so the repository object is never fetched
+            gh_repo = self.lazy_g.get_repo(repo["nameWithOwner"])
+
             # Apply metadata changes
             if "name" in changes or "description" in changes or "private" in changes:
-                repo.edit(
-                    name=changes.get("name", repo.name),
-                    description=changes.get("description", repo.description),
-                    private=changes.get("private", repo.private),
+                gh_repo.edit(
+                    name=changes.get("name", repo["name"]),
+                    description=changes.get("description", repo["description"]),
+                    private=changes.get("private", repo["isPrivate"]),
                 )
 
             # Apply branch protection changes
             if "branch_protection" in changes:
-                branch = repo.get_branch(repo.default_branch)
+                branch = gh_repo.get_branch(repo["defaultBranchRef"]["name"])
                 protection_changes = changes["branch_protection"]
+                current = protection_changes["current"]
+
+                # Updating protection replaces every setting, so one call carries the changes and the
+                # current values of everything else
+                protection = {"enforce_admins": protection_changes.get("enforce_admins", current["isAdminEnforced"])}
 
                 # Update required status checks
                 if "required_status_checks" in protection_changes:
-                    current_contexts = branch.get_protection().required_status_checks.contexts
-                    new_contexts = list(
-                        set(current_contexts)
-                        | set(protection_changes["required_status_checks"].get("add", []))
-                        - set(protection_changes["required_status_checks"].get("remove", []))
+                    status_check_changes = protection_changes["required_status_checks"]
+                    protection["contexts"] = list(
+                        (
+                            frozenset(current["requiredStatusCheckContexts"])
+                            | frozenset(status_check_changes.get("add", []))
+                        )
+                        - frozenset(status_check_changes.get("remove", []))
                     )
-                    branch.edit_protection(required_status_checks={"contexts": new_contexts})
-
-                # Update enforce admins
-                if "enforce_admins" in protection_changes:
-                    if protection_changes["enforce_admins"]:
-                        branch.edit_protection(enforce_admins=True)
-                    else:
-                        branch.edit_protection(enforce_admins=False)
+                elif current["requiresStatusChecks"]:
+                    protection["contexts"] = current["requiredStatusCheckContexts"]
+                if "contexts" in protection:
+                    protection["strict"] = current["requiresStrictStatusChecks"]
 
                 # Update pull request reviews
                 if "required_pull_request_reviews" in protection_changes:
                     review_changes = protection_changes["required_pull_request_reviews"]
-                    branch.edit_protection(
-                        required_pull_request_reviews={
-                            "required_approving_review_count": review_changes.get("required_approving_review_count", 1)
-                        }
+                    protection["required_approving_review_count"] = review_changes.get(
+                        "required_approving_review_count", 1
                     )
+                elif current["requiresApprovingReviews"]:
+                    protection["required_approving_review_count"] = current["requiredApprovingReviewCount"]
+                if "required_approving_review_count" in protection and current["requiresApprovingReviews"]:
+                    protection["dismiss_stale_reviews"] = current["dismissesStaleReviews"]
+                    protection["require_code_owner_reviews"] = current["requiresCodeOwnerReviews"]
+
+                branch.edit_protection(**protection)
 
             # Manage collaborators
             if "collaborators" in changes:
-                collab_changes = changes["collaborators"]
-
-                # Add new collaborators
-                for username in collab_changes.get("add", []):
-                    repo.add_to_collaborators(username)
-
-                # Remove collaborators
-                for username in collab_changes.get("remove", []):
-                    repo.remove_collaborator(username)
+                self._apply_collaborator_changes(gh_repo, changes["collaborators"])
 
         except Exception as e:
             print(f"Error applying repository changes: {e}")
 
+    def _apply_collaborator_changes(self, gh_repo, collab_changes):
+        """
+        Add and remove collaborators concurrently, reporting each failure without stopping the rest
+
+        :param gh_repo: GitHub Repository object
+        :param collab_changes: Dictionary with the collaborators to add and remove
+        """
+        with ThreadPoolExecutor(max_workers=COLLABORATOR_WORKERS) as executor:
+            futures = {
+                executor.submit(gh_repo.add_to_collaborators, username): f"add collaborator {username}"
+                for username in collab_changes.get("add", [])
+            }
+            futures.update(
+                {
+                    executor.submit(gh_repo.remove_collaborator, username): f"remove collaborator {username}"
+                    for username in collab_changes.get("remove", [])
+                }
+            )
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except GithubException as e:
+                    print(f"Could not {futures[future]}: {e}")
+
 
 def main():
     # This would typically be passed as environment variables or arguments
@@ -203,13 +434,25 @@ def main():
 
     config_manager = RepositoryConfigManager(github_token, org_name)
 
-    # Iterate through repositories in the organization
-    for repo in config_manager.org.get_repos():
-        changes = config_manager.validate_repository_config(repo)
+    # Process repositories concurrently while later pages are still being listed
+    failed = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(config_manager.process_repository, repo): repo["nameWithOwner"]
+            for repo in config_manager.iter_repositories()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error processing repository {futures[future]}: {e}")
+                failed.append(futures[future])
+
+    config_manager.save_repository_state()
 
-        if changes:
-            print(f"Applying changes to repository: {repo.full_name}")
-            config_manager.apply_repository_changes(repo, changes)
+    if failed:
+        print(f"Failed to process {len(failed)} repositories: {', '.join(sorted(failed))}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
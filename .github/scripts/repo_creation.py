@@ -1,22 +1,72 @@
 import os
-import sys
 import re
-import json
+import sys
+import time
+import string
 import logging
-from github import Github, GithubException
+from functools import lru_cache
+from github import GithubException
+from github_client import get_github, get_organization
 
 # Import the config generation functions
-from repo_config_generator import generate_repository_config, save_repository_config
+from repo_config_generator import generate_repository_config, save_repository_config, serialize_repository_config
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
-# Setup logging
+
+# Setup logging, debug output is opt-in following the runner's debug logging setting
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.DEBUG if os.environ.get("RUNNER_DEBUG") == "1" else logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(sys.stdout), logging.FileHandler("repo_creation_debug.log")],
 )
 
-from github import Github, GithubException
+# Characters GitHub allows in repository names
+REPOSITORY_NAME_CHARACTERS = frozenset(string.ascii_letters + string.digits + "._-")
+
+# Names GitHub rejects, plus the organization-wide .github repository, which is not created through issues
+RESERVED_REPOSITORY_NAMES = frozenset({".", "..", ".github"})
+
+# Issue form lines: field labels, either "### Label" headings as GitHub renders issue forms or lines ending in ":",
+# checked checkboxes, and plain input values.
+# Blank lines, other markdown headings and other list items match none of the groups and are skipped.
+ISSUE_FORM_LINE_PATTERN = re.compile(
+    r"^[^\S\n]*###[^\S\n]+(?P<heading>[^\n]*?)[^\S\n]*$"
+    r"|^(?![^\S\n]*##)[^\S\n]*"
+    r"(?:(?P<label>[^\n]*:)|- \[[xX]\][^\S\n]*(?P<checked>[^\n]*?)|(?P<value>[^\s-][^\n]*?))[^\S\n]*$",
+    re.MULTILINE,
+)
+
+# What GitHub renders for an issue form field left empty
+ISSUE_FORM_NO_RESPONSE = "_No response_"
+
+# Normalised issue form labels mapped to the input fields they fill
+REQUIRED_ISSUE_FIELDS = {
+    "repository name": "repo_name",
+    "repository description": "description",
+    "repository visibility": "visibility",
+}
+OPTIONAL_ISSUE_FIELDS = {"teams": "teams", "additional notes": "notes"}
+
+# Seconds a repository existence lookup is trusted before GitHub is asked again
+REPOSITORY_EXISTS_TTL = 300
+
+# Where the generated configuration is committed in the new repository
+REPOSITORY_SETTINGS_PATH = ".github/repo_settings.yml"
+
+# Remaining GraphQL points below which creation is likely to be throttled
+RATE_LIMIT_WARNING_THRESHOLD = 100
+
+# Whether a repository exists, and the rate limit left for creating it, in one request
+REPOSITORY_CONTEXT_QUERY = """
+query($org: String!, $name: String!) {
+  repository(owner: $org, name: $name) { id }
+  rateLimit { remaining resetAt }
+}
+"""
 
 
 def get_github_context():
@@ -27,18 +77,21 @@ def get_github_context():
     github_token = os.environ.get("GITHUB_TOKEN")
     github_event_path = os.environ.get("GITHUB_EVENT_PATH")
 
-    logging.debug(f"GITHUB_TOKEN present: {bool(github_token)}")
-    logging.debug(f"GITHUB_EVENT_PATH: {github_event_path}")
+    logging.debug("GITHUB_TOKEN present: %s", bool(github_token))
+    logging.debug("GITHUB_EVENT_PATH: %s", github_event_path)
 
     # Parse GitHub event payload
     event_payload = {}
-    if github_event_path and os.path.exists(github_event_path):
+    if github_event_path:
         try:
-            with open(github_event_path, "r") as event_file:
-                event_payload = json.load(event_file)
+            with open(github_event_path, "rb") as event_file:
+                event_payload = _json_loads(event_file.read())
             logging.debug("Event payload successfully parsed")
+        except FileNotFoundError:
+            # No payload for this event, the context falls back to environment variables
+            pass
         except Exception as e:
-            logging.error(f"Error parsing event payload: {e}")
+            logging.error("Error parsing event payload: %s", e)
 
     # Extract context information
     context = {
@@ -62,16 +115,76 @@ def get_github_context():
     # Logging all extracted context
     logging.debug("GitHub Context:")
     for key, value in context.items():
-        logging.debug(f"{key}: {value}")
+        logging.debug("%s: %s", key, value)
 
     return context, event_payload
 
 
 class RepositoryCreationHandler:
     def __init__(self, github_token, org_name):
-        self.g = Github(github_token)
-        self.org = self.g.get_organization(org_name)
+        self.g = get_github(github_token)
+        self.org = get_organization(github_token, org_name)
         self.org_name = org_name
+        # Lowercased repository name -> (checked_at, exists), since GitHub repository names are case-insensitive
+        self._repository_exists = {}
+        self.rate_limit = None
+
+    def _graphql(self, query, variables):
+        """
+        Run a GraphQL query through the authenticated PyGithub requester
+
+        :param query: GraphQL query document
+        :param variables: Query variables
+        :return: The response data
+        """
+        _, response = self.g._Github__requester.requestJsonAndCheck(
+            "POST", "/graphql", input={"query": query, "variables": variables}
+        )
+        if response.get("data") is None:
+            raise GithubException(400, response, None)
+        for error in response.get("errors", []):
+            # Missing objects come back as null fields, which callers check for themselves
+            if error.get("type") != "NOT_FOUND":
+                logging.error("GraphQL error: %s", error.get("message"))
+        return response["data"]
+
+    def repository_exists(self, name):
+        """
+        Check whether a repository exists in the organization, reusing recent answers
+
+        :param name: Repository name
+        :return: bool - True if the repository exists
+        """
+        key = name.lower()
+        cached = self._repository_exists.get(key)
+        if cached and time.monotonic() - cached[0] < REPOSITORY_EXISTS_TTL:
+            return cached[1]
+
+        try:
+            data = self._graphql(REPOSITORY_CONTEXT_QUERY, {"org": self.org_name, "name": name})
+        except GithubException as e:
+            # A failed lookup doesn't prove the name is free, so it is not cached
+            logging.warning("Could not check whether repository '%s' exists: %s", name, e)
+            return False
+
+        # Keep the rate limit details for the creation that follows a successful validation
+        self.rate_limit = data["rateLimit"]
+        if self.rate_limit["remaining"] < RATE_LIMIT_WARNING_THRESHOLD:
+            logging.warning(
+                "Only %s GraphQL points left until %s", self.rate_limit["remaining"], self.rate_limit["resetAt"]
+            )
+
+        exists = data["repository"] is not None
+        self._repository_exists[key] = (time.monotonic(), exists)
+        return exists
+
+    def remember_repository(self, name):
+        """
+        Record a repository created by this handler so later checks see it without an API call
+
+        :param name: Repository name
+        """
+        self._repository_exists[name.lower()] = (time.monotonic(), True)
 
     def validate_repository_name(self, name):
         """
@@ -88,15 +201,15 @@ class RepositoryCreationHandler:
             return False, "Repository name must be 100 characters or less"
 
         # Check for valid characters (letters, numbers, hyphens, underscores)
-        if not re.match(r"^[a-zA-Z0-9._-]+$", name):
+        if not REPOSITORY_NAME_CHARACTERS.issuperset(name):
             return False, "Repository name can only contain letters, numbers, hyphens, and underscores"
 
-        # Check if repository already exists
-        try:
-            self.org.get_repo(name)
+        if name.lower() in RESERVED_REPOSITORY_NAMES:
+            return False, f"Repository name '{name}' is reserved"
+
+        # Check if repository already exists, only once every offline check has passed
+        if self.repository_exists(name):
             return False, f"Repository '{name}' already exists in the organization"
-        except GithubException:
-            pass
 
         return True, "Repository name is valid"
 
@@ -110,8 +223,10 @@ class RepositoryCreationHandler:
         if not description:
             return False, "Description cannot be empty"
 
-        if len(description) > 350:  # GitHub's description length limit
-            return False, "Description must be 350 characters or less"
+        # GitHub's description length limit applies to the UTF-8 encoding, ASCII text is one byte per character
+        length = len(description) if description.isascii() else len(description.encode("utf-8"))
+        if length > 350:
+            return False, "Description must be 350 characters or less, counting non-ASCII characters as several"
 
         return True, "Description is valid"
 
@@ -122,9 +237,9 @@ class RepositoryCreationHandler:
         :param visibility: Desired visibility setting
         :return: tuple(bool, str) - (is_valid, message)
         """
-        valid_values = ["private", "internal"]
+        valid_values = ["private", "public"]
         if not visibility.lower() in valid_values:
-            return False, "Visibility must be either 'private' or 'internal'"
+            return False, "Visibility must be either 'private' or 'public'"
         return True, "Visibility setting is valid"
 
     def parse_issue_body(self, body):
@@ -133,32 +248,26 @@ class RepositoryCreationHandler:
         """
         input_data = {"required": {}, "optional": {}, "branch_protection": []}
 
-        lines = body.split("\n")
         current_section = None
         current_data = []
 
-        for line in lines:
-            line = line.strip()
-
-            # Skip empty lines and markdown section
-            if not line or line.startswith("##"):
-                continue
+        # Classify every line of the body in a single pass over the string
+        for match in ISSUE_FORM_LINE_PATTERN.finditer(body):
+            heading, label, checked, value = match.group("heading", "label", "checked", "value")
 
             # Handle section headers (identified by form field labels)
-            if line.endswith(":") or line.endswith(" (Optional):"):
+            if heading is not None or label is not None:
                 if current_section and current_data:
                     self._process_section(current_section, current_data, input_data)
-                current_section = line.replace(":", "").replace(" (Optional)", "").lower()
+                current_section = (label or heading).replace(":", "").replace(" (Optional)", "").lower()
                 current_data = []
-                continue
-
             # Collect checkbox selections for branch protection
-            if line.startswith("- [x]"):
+            elif checked is not None:
                 if current_section == "branch protection settings":
-                    input_data["branch_protection"].append(line[5:].strip())
+                    input_data["branch_protection"].append(checked)
             # Collect regular input data
-            elif line and not line.startswith("-"):
-                current_data.append(line)
+            else:
+                current_data.append(value)
 
         # Process the last section
         if current_section and current_data:
@@ -168,26 +277,21 @@ class RepositoryCreationHandler:
 
     def _process_section(self, section, data, input_data):
         """Helper method to process each section of the issue form"""
-        clean_data = [line for line in data if line and not line.startswith(">")]
+        clean_data = [line for line in data if line and not line.startswith(">") and line != ISSUE_FORM_NO_RESPONSE]
         if not clean_data:
             return
 
         value = "\n".join(clean_data) if len(clean_data) > 1 else clean_data[0]
 
-        # Map sections to required or optional fields
-        required_fields = {
-            "repository name": "repo_name",
-            "repository description": "description",
-            "repository visibility": "visibility",
-        }
+        # Dropdown options may carry a hint, as in "Private (Recommended)"
+        if section == "repository visibility":
+            value = value.split(" (", 1)[0]
 
-        optional_fields = {"teams": "teams", "additional notes": "notes"}
-
-        section = section.lower()
-        if section in required_fields:
-            input_data["required"][required_fields[section]] = value
-        elif section in optional_fields:
-            input_data["optional"][optional_fields[section]] = value
+        # Map sections to required or optional fields, labels are already normalised by parse_issue_body
+        if section in REQUIRED_ISSUE_FIELDS:
+            input_data["required"][REQUIRED_ISSUE_FIELDS[section]] = value
+        elif section in OPTIONAL_ISSUE_FIELDS:
+            input_data["optional"][OPTIONAL_ISSUE_FIELDS[section]] = value
 
     def validate_input(self, input_data):
         """
@@ -220,68 +324,17 @@ class RepositoryCreationHandler:
         """
         Process repository creation issue with improved validation and feedback
         """
-        logging.info(f"Processing issue #{issue.number}")
-
-    def validate_repository_name(self, name):
-        """
-        Validate repository name according to GitHub naming conventions
-
-        :param name: Repository name to validate
-        :return: tuple(bool, str) - (is_valid, message)
-        """
-        if not name:
-            return False, "Repository name cannot be empty"
-
-        # GitHub repository naming rules
-        if len(name) > 100:
-            return False, "Repository name must be 100 characters or less"
-
-        # Check for valid characters (letters, numbers, hyphens, underscores)
-        if not re.match(r"^[a-zA-Z0-9._-]+$", name):
-            return False, "Repository name can only contain letters, numbers, hyphens, and underscores"
+        logging.info("Processing issue #%s", issue.number)
 
-        # Check if repository already exists
-        try:
-            self.org.get_repo(name)
-            return False, f"Repository '{name}' already exists in the organization"
-        except GithubException:
-            pass
-
-        return True, "Repository name is valid"
-
-    def validate_description(self, description):
-        """
-        Validate repository description
-
-        :param description: Repository description to validate
-        :return: tuple(bool, str) - (is_valid, message)
-        """
-        if not description:
-            return False, "Description cannot be empty"
-
-        if len(description) > 350:  # GitHub's description length limit
-            return False, "Description must be 350 characters or less"
-
-        return True, "Description is valid"
-
-    def validate_visibility(self, visibility):
-        """
-        Validate repository visibility setting
-
-        :param visibility: Desired visibility setting
-        :return: tuple(bool, str) - (is_valid, message)
-        """
-        valid_values = ["private", "public"]
-        if not visibility.lower() in valid_values:
-            return False, "Visibility must be either 'private' or 'public'"
-        return True, "Visibility setting is valid"  # Parse issue body
+        # Parse issue body
         input_data = self.parse_issue_body(issue.body)
 
         # Validate inputs
         validation_results = self.validate_input(input_data)
 
-        # Check if all validations passed
-        if all(result[0] for result in validation_results.values()):
+        # Collect the failed validations, creating the repository only if there are none
+        failures = [(field, message) for field, (is_valid, message) in validation_results.items() if not is_valid]
+        if not failures:
             # Generate repository configuration
             config = self.generate_repository_config(input_data)
             repo = self.create_repository(config)
@@ -289,46 +342,81 @@ class RepositoryCreationHandler:
             if repo:
                 self._post_success_comment(issue, repo, input_data)
                 issue.edit(state="closed")
-                logging.info(f"Repository {repo.name} created successfully")
+                logging.info("Repository %s created successfully", repo.name)
             else:
                 self._post_error_comment(issue)
                 logging.error("Repository creation failed")
         else:
-            feedback_comment = self.generate_validation_comment(validation_results)
+            feedback_comment = self.generate_validation_comment(failures)
             issue.create_comment(feedback_comment)
             logging.warning("Repository creation validation failed")
 
-    def generate_validation_comment(self, validation_results):
+    def generate_validation_comment(self, failures):
         """
         Generate a comment with validation feedback
 
-        :param validation_results: Dictionary of validation results
+        :param failures: List of (field, message) tuples for the failed validations
         :return: str - Formatted comment
         """
-        comment = "## ❌ Validation Failed\n\nPlease fix the following issues:\n\n"
-
-        for field, (is_valid, message) in validation_results.items():
-            if not is_valid:
-                comment += f"- **{field.title()}**: {message}\n"
-
-        comment += "\nPlease update the issue with corrected information."
-        return comment
+        parts = ["## ❌ Validation Failed\n\nPlease fix the following issues:\n\n"]
+        parts.extend(f"- **{field.title()}**: {message}\n" for field, message in failures)
+        parts.append("\nPlease update the issue with corrected information.")
+        return "".join(parts)
 
     def generate_repository_config(self, input_data):
         """
         Generate repository configuration from input data
 
-        :param input_data: Dictionary of repository inputs
+        :param input_data: Dictionary of repository inputs, as returned by parse_issue_body
         :return: Dictionary of repository configuration
         """
+        required, optional = input_data["required"], input_data["optional"]
         return {
-            "name": input_data.get("repo-name", ""),
-            "description": input_data.get("description", ""),
-            "visibility": input_data.get("visibility", "private"),
-            "collaborators": input_data.get("collaborators", "").split("\n") if input_data.get("collaborators") else [],
-            "teams": input_data.get("teams", "").split("\n") if input_data.get("teams") else [],
+            "name": required.get("repo_name", ""),
+            "description": required.get("description", ""),
+            "visibility": required.get("visibility", "private"),
+            "collaborators": collaborators.split("\n") if (collaborators := optional.get("collaborators")) else [],
+            "teams": teams.split("\n") if (teams := optional.get("teams")) else [],
         }
 
+    def create_repository(self, config):
+        """
+        Create the repository with its configuration file as the initial commit
+
+        :param config: Dictionary of repository configuration
+        :return: Repository object, or None if creation failed
+        """
+        try:
+            # Without auto_init the configuration file becomes the first commit. The contents API is used
+            # for it because the Git Data API rejects writes to empty repositories
+            repo = self.org.create_repo(
+                name=config["name"],
+                description=config["description"],
+                visibility=config["visibility"].lower(),
+                auto_init=False,
+            )
+            self.remember_repository(repo.name)
+
+            # Serialize the configuration once and reuse it for the local copy and the commit
+            repo_config = generate_repository_config(
+                {
+                    "name": repo.name,
+                    "description": config["description"],
+                    "private": config["visibility"].lower() != "public",
+                    "collaborators": config["collaborators"],
+                    "teams": config["teams"],
+                }
+            )
+            content = serialize_repository_config(repo_config)
+            save_repository_config(repo.name, repo_config, content)
+            repo.create_file(REPOSITORY_SETTINGS_PATH, "Add repository configuration", content)
+
+            return repo
+
+        except GithubException as e:
+            logging.error("Error creating repository %s: %s", config["name"], e)
+            return None
+
     def _post_success_comment(self, issue, repo, input_data):
         """Post a detailed success comment"""
         success_comment = f"""
@@ -378,13 +466,42 @@ def get_current_repository(g, full_repo_name):
     """
     try:
         repo = g.get_repo(full_repo_name)
-        logging.info(f"Using current repository: {full_repo_name}")
+        logging.info("Using current repository: %s", full_repo_name)
         return repo
     except GithubException as e:
-        logging.error(f"Error accessing current repository: {e}")
+        logging.error("Error accessing current repository: %s", e)
         sys.exit(1)
 
 
+@lru_cache(maxsize=None)
+def get_handler(github_token, org_name):
+    """
+    Get the repository creation handler for an organization, kept for every event handled by this process
+
+    :param github_token: GitHub Personal Access Token
+    :param org_name: GitHub Organization Name
+    :return: RepositoryCreationHandler instance
+    """
+    return RepositoryCreationHandler(github_token, org_name)
+
+
+def handle_event(context):
+    """
+    Process the repository creation issue an event refers to
+
+    Everything built here is cached, so a long-running process can call this once per event
+    without repeating the client setup or the repository existence lookups.
+
+    :param context: GitHub context as returned by get_github_context, with an issue number
+    """
+    # Get the current repository where the action is running
+    current_repo = get_current_repository(get_github(context["token"]), context["repository"])
+
+    # Retrieve and process the issue
+    issue = current_repo.get_issue(context["issue_number"])
+    get_handler(context["token"], context["organization"]).process_issue(issue)
+
+
 def main():
     # Get GitHub context and event payload
     context, event_payload = get_github_context()
@@ -398,26 +515,14 @@ def main():
         logging.error("Repository could not be determined")
         sys.exit(1)
 
-    # Initialize GitHub instance
-    g = Github(context["token"])
+    if not context["issue_number"]:
+        logging.error("No issue number found in the event payload")
+        sys.exit(1)
 
     try:
-        # Get the current repository where the action is running
-        current_repo = get_current_repository(g, context["repository"])
-
-        # Retrieve issue
-        if context["issue_number"]:
-            issue = current_repo.get_issue(context["issue_number"])
-
-            # Process the issue
-            handler = RepositoryCreationHandler(context["token"], context["organization"])
-            handler.process_issue(issue)
-        else:
-            logging.error("No issue number found in the event payload")
-            sys.exit(1)
-
+        handle_event(context)
     except Exception as e:
-        logging.error(f"Error processing repository creation: {e}", exc_info=True)
+        logging.error("Error processing repository creation: %s", e, exc_info=True)
         sys.exit(1)
 
 
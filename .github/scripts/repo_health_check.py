@@ -1,14 +1,88 @@
 # config.yaml
 import os
+import csv
+import copy
 import sys
+import json
+import time
+import heapq
 import argparse
-import pandas as pd
+import tempfile
+from collections import Counter
 from datetime import datetime
 import concurrent.futures
-from tqdm import tqdm
+from functools import lru_cache
 from typing import Dict
+from tqdm import tqdm
 import yaml
-from github import Github
+from github import Github, GithubException
+
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+# Repositories fetched per GraphQL request, keeping each response well inside GitHub's node limits
+HEALTH_BATCH_SIZE = 25
+
+# Everything check_single_repo needs from a repository beyond the organization listing.
+# The Dependabot fields need admin access, and a denied non-null hasVulnerabilityAlertsEnabled nulls the whole
+# repository it is requested on, so they are requested on a second alias of each repository.
+REPOSITORY_HEALTH_FRAGMENT = """
+fragment RepositoryHealth on Repository {
+  root: object(expression: "HEAD:") { ... on Tree { entries { name } } }
+  github: object(expression: "HEAD:.github") { ... on Tree { entries { name } } }
+}
+fragment RepositoryDependabot on Repository {
+  hasVulnerabilityAlertsEnabled
+  vulnerabilityAlerts(first: 100, states: [OPEN]) {
+    pageInfo { hasNextPage endCursor }
+    nodes { securityVulnerability { severity } }
+  }
+}
+"""
+
+# Further open alerts of a repository with more than one page of them
+VULNERABILITY_ALERTS_PAGE_QUERY = """
+query($owner: String!, $name: String!, $after: String!) {
+  repository(owner: $owner, name: $name) {
+    vulnerabilityAlerts(first: 100, after: $after, states: [OPEN]) {
+      pageInfo { hasNextPage endCursor }
+      nodes { securityVulnerability { severity } }
+    }
+  }
+}
+"""
+
+# Repository health fetched by earlier runs, reused while the repository has not been pushed to.
+# RUNNER_TEMP is emptied between jobs, so the workflow restores and saves this directory with actions/cache
+HEALTH_CACHE_DIR = os.path.join(os.environ.get("RUNNER_TEMP", tempfile.gettempdir()), "repo_health_cache")
+
+# Alerts can change without a push, so cached health is only trusted for a few hours
+HEALTH_CACHE_TTL = 6 * 60 * 60
+
+# GraphQL reports moderate severity where the configuration calls it medium
+GRAPHQL_SEVERITIES = {"CRITICAL": "critical", "HIGH": "high", "MODERATE": "medium", "LOW": "low"}
+
+
+@lru_cache(maxsize=None)
+def build_health_query(batch_size: int) -> str:
+    """Build a query fetching the health of batch_size repositories, aliased r0, r1, ... and d0, d1, ..."""
+    variables = ", ".join(f"$name{i}: String!" for i in range(batch_size))
+    repositories = "\n".join(
+        f"  r{i}: repository(owner: $owner, name: $name{i}) {{ ...RepositoryHealth }}\n"
+        f"  d{i}: repository(owner: $owner, name: $name{i}) {{ ...RepositoryDependabot }}"
+        for i in range(batch_size)
+    )
+    return f"query($owner: String!, {variables}) {{\n{repositories}\n}}\n{REPOSITORY_HEALTH_FRAGMENT}"
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path: str, _mtime_ns: int) -> Dict:
+    """Parse a YAML file, keyed by its modification time so edits are picked up."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def parse_args():
@@ -35,8 +109,9 @@ class ConfigManager:
         if not os.path.exists(self.config_path):
             self.create_default_config()
 
-        with open(self.config_path, "r") as f:
-            return yaml.safe_load(f)
+        # The parse is shared between managers of the same unchanged file, so each gets its own copy
+        path = os.path.abspath(self.config_path)
+        return copy.deepcopy(_load_yaml(path, os.stat(path).st_mtime_ns))
 
     def create_default_config(self):
         """Create default configuration file if none exists."""
@@ -80,8 +155,8 @@ class ConfigManager:
             },
         }
 
-        with open(self.config_path, "w") as f:
-            yaml.safe_dump(default_config, f, sort_keys=False)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(default_config, f, Dumper=_YamlDumper, sort_keys=False)
 
 
 class GitHubOrgHealthCheck:
@@ -94,13 +169,124 @@ class GitHubOrgHealthCheck:
             org_name (str): GitHub organization name
             config_path (str): Path to configuration file
         """
-        self.g = Github(token)
+        self.g = Github(token, per_page=100)
         self.org = self.g.get_organization(org_name)
         self.config_manager = ConfigManager(config_path)
         self.config = self.config_manager.config
+        # Required files by lowercased name, and their total weight, shared by every repository check
+        self._required_files_by_name = {file.lower(): file for file in self.config["required_files"]}
+        self._required_files_weight = sum(
+            file_config["weight"] for file_config in self.config["required_files"].values() if file_config["required"]
+        )
+        # Scoring weights as (name, weight) pairs, iterated for every repository
+        self._alert_severity_weights = tuple(self.config["alert_severity_weights"].items())
+        self._component_weights = tuple(self.config["scoring"]["component_weights"].items())
+        self._total_component_weight = sum(weight for _, weight in self._component_weights)
+        # Versioned, so entries cached before Dependabot health moved into its own node are not reused
+        self._health_cache_file = os.path.join(HEALTH_CACHE_DIR, f"repo_health_{org_name}.v2.json")
+        self._health_cache = self._load_health_cache()
+
+    def _load_health_cache(self) -> Dict:
+        """Load repository health cached by earlier runs, dropping entries older than the TTL."""
+        try:
+            with open(self._health_cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        now = time.time()
+        return {name: entry for name, entry in cache.items() if now - entry["fetched_at"] < HEALTH_CACHE_TTL}
+
+    def _save_health_cache(self):
+        """Persist the repository health cache for later runs."""
+        temp_path = f"{self._health_cache_file}.tmp"
+        try:
+            os.makedirs(HEALTH_CACHE_DIR, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._health_cache, f)
+            os.replace(temp_path, self._health_cache_file)
+        except OSError as e:
+            print(f"Could not save repository health cache: {str(e)}")
+
+    def _cached_health(self, repo):
+        """Get the cached health of a repository, if it has not been pushed to since it was fetched."""
+        entry = self._health_cache.get(repo.full_name)
+        if entry and entry["pushed_at"] == (repo.pushed_at.isoformat() if repo.pushed_at else None):
+            return entry["health"]
+        return None
+
+    def _graphql(self, query: str, variables: Dict) -> Dict:
+        """Run a GraphQL query, reporting errors that only nulled part of the response."""
+        _, response = self.g._Github__requester.requestJsonAndCheck(
+            "POST", "/graphql", input={"query": query, "variables": variables}
+        )
+        for error in response.get("errors", []):
+            print(f"GraphQL error: {error.get('message')}")
+        return response.get("data") or {}
+
+    def _fetch_remaining_alerts(self, repo, alerts: Dict):
+        """Page through the open alerts of a repository with more than 100, adding them to the first page."""
+        owner, name = repo.full_name.split("/", 1)
+        while alerts["pageInfo"]["hasNextPage"]:
+            data = self._graphql(
+                VULNERABILITY_ALERTS_PAGE_QUERY,
+                {"owner": owner, "name": name, "after": alerts["pageInfo"]["endCursor"]},
+            )
+            page = (data.get("repository") or {}).get("vulnerabilityAlerts")
+            if not page:
+                raise GithubException(400, data, None)
+            alerts["nodes"].extend(page["nodes"])
+            alerts["pageInfo"] = page["pageInfo"]
+
+    def fetch_repository_health(self, repos) -> Dict:
+        """
+        Fetch the files, alert settings and open alerts of several repositories in one GraphQL request.
 
-    def check_single_repo(self, repo):
-        """Check health metrics for a single repository."""
+        Args:
+            repos (list): Repositories from the same organization
+
+        Returns:
+            Dict: Repository health nodes keyed by full name, empty when the request failed.
+            A node's dependabot entry is None when the alert settings could not be read.
+        """
+        owner = repos[0].full_name.split("/", 1)[0]
+        variables = {"owner": owner}
+        variables.update({f"name{i}": repo.name for i, repo in enumerate(repos)})
+        try:
+            data = self._graphql(build_health_query(len(repos)), variables)
+        except GithubException as e:
+            print(f"Error fetching repository health: {str(e)}")
+            return {}
+
+        # Fields that failed for one repository leave it null without failing the rest of the batch
+        health = {}
+        now = time.time()
+        for i, repo in enumerate(repos):
+            node = data.get(f"r{i}")
+            if not node:
+                continue
+            node["dependabot"] = data.get(f"d{i}")
+            alerts = (node["dependabot"] or {}).get("vulnerabilityAlerts")
+            if alerts:
+                try:
+                    self._fetch_remaining_alerts(repo, alerts)
+                except GithubException as e:
+                    print(f"Error fetching alerts for {repo.full_name}: {str(e)}")
+                    node["dependabot"] = None
+            health[repo.full_name] = node
+            self._health_cache[repo.full_name] = {
+                "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
+                "fetched_at": now,
+                "health": node,
+            }
+        return health
+
+    def check_single_repo(self, repo, health=None):
+        """
+        Check health metrics for a single repository, using its node from fetch_repository_health.
+
+        Repositories whose health could not be fetched are marked UNKNOWN instead of being scored.
+        """
         try:
             metrics = {
                 "repository": repo.full_name,
@@ -121,30 +307,27 @@ class GitHubOrgHealthCheck:
             if repo.private and not self.config["scanning"]["include_private"]:
                 return metrics
 
-            # Check required files
-            try:
-                contents = repo.get_contents("")
-                for content in contents:
-                    if content.name.upper() in [f.upper() for f in self.config["required_files"].keys()]:
-                        metrics["required_files"][content.name] = True
+            # A failed batch or a repository the query could not resolve says nothing about its health
+            if health is None:
+                metrics["traffic_light"] = "UNKNOWN"
+                return metrics
 
-                # Check .github folder for PR template
-                try:
-                    github_contents = repo.get_contents(".github")
-                    for content in github_contents:
-                        if content.name.upper() == "PULL_REQUEST_TEMPLATE.MD":
-                            metrics["required_files"]["pull_request_template.md"] = True
-                except:
-                    pass
-            except:
-                pass
+            # Check required files, listed from the default branch's root tree
+            root_entries = (health.get("root") or {}).get("entries", [])
+            for content in root_entries:
+                # Record matches under the configured spelling, so a README.MD counts for README.md
+                file = self._required_files_by_name.get(content["name"].lower())
+                if file:
+                    metrics["required_files"][file] = True
+
+            # Check .github folder for PR template
+            github_entries = (health.get("github") or {}).get("entries", [])
+            for content in github_entries:
+                if content["name"].upper() == "PULL_REQUEST_TEMPLATE.MD":
+                    metrics["required_files"]["pull_request_template.md"] = True
 
             # Calculate required files score with weights
-            total_weight = sum(
-                file_config["weight"]
-                for file_config in self.config["required_files"].values()
-                if file_config["required"]
-            )
+            total_weight = self._required_files_weight
 
             weighted_sum = sum(
                 self.config["required_files"][file]["weight"]
@@ -157,42 +340,59 @@ class GitHubOrgHealthCheck:
             # Check security features
             security_config = self.config["security_requirements"]
             try:
-                security_info = repo.get_security_and_analysis()
-                metrics["security_scanning"] = (
-                    security_info.advanced_security.status == "enabled" if security_info.advanced_security else False
+                security_info = repo.security_and_analysis
+                metrics["security_scanning"] = bool(
+                    security_info
+                    and security_info.advanced_security
+                    and security_info.advanced_security.status == "enabled"
                 )
-            except:
-                pass
-
-            # Check Dependabot with configured weights
-            try:
-                metrics["dependabot_enabled"] = repo.get_vulnerability_alert()
+            except GithubException as e:
+                # Reported rather than skipped silently, so a throttled or forbidden lookup shows up in the logs
+                print(f"Could not read security settings for {repo.full_name}: {str(e)}")
+
+            # Check Dependabot with configured weights, left as not known when the token cannot read it
+            dependabot = health.get("dependabot")
+            if dependabot is None or (
+                dependabot["hasVulnerabilityAlertsEnabled"] and dependabot.get("vulnerabilityAlerts") is None
+            ):
+                metrics["dependabot_enabled"] = None
+                metrics["alert_score"] = None
+            else:
+                metrics["dependabot_enabled"] = dependabot["hasVulnerabilityAlertsEnabled"]
                 if metrics["dependabot_enabled"]:
-                    alerts = repo.get_vulnerability_alerts()
-                    for alert in alerts:
-                        severity = alert.security_advisory.severity.lower()
+                    for alert in dependabot["vulnerabilityAlerts"]["nodes"]:
+                        severity = GRAPHQL_SEVERITIES.get(alert["securityVulnerability"]["severity"])
                         if severity in metrics["dependabot_alerts"]:
                             metrics["dependabot_alerts"][severity] += 1
-            except:
-                pass
 
-            # Calculate alert score using configured weights
-            weighted_sum = sum(
-                metrics["dependabot_alerts"][severity] * weight
-                for severity, weight in self.config["alert_severity_weights"].items()
-            )
-            metrics["alert_score"] = max(0, 100 - (weighted_sum * 10))
+                # Calculate alert score using configured weights
+                weighted_sum = sum(
+                    metrics["dependabot_alerts"][severity] * weight for severity, weight in self._alert_severity_weights
+                )
+                metrics["alert_score"] = max(0, 100 - (weighted_sum * 10))
 
             # Calculate overall health score using configured weights
-            component_weights = self.config["scoring"]["component_weights"]
             scores = {
                 "required_files": metrics["required_files_score"],
                 "security_scanning": 100 if metrics["security_scanning"] else 0,
-                "dependabot": metrics["alert_score"] if metrics["dependabot_enabled"] else 0,
+                "dependabot": (
+                    None
+                    if metrics["dependabot_enabled"] is None
+                    else metrics["alert_score"] if metrics["dependabot_enabled"] else 0
+                ),
             }
 
-            metrics["overall_score"] = sum(
-                scores[component] * weight for component, weight in component_weights.items()
+            # Components that are not known are left out, and the rest scaled up to the full weight
+            known_weights = [
+                (component, weight) for component, weight in self._component_weights if scores[component] is not None
+            ]
+            known_weight = sum(weight for _, weight in known_weights)
+            metrics["overall_score"] = (
+                sum(scores[component] * weight for component, weight in known_weights)
+                * self._total_component_weight
+                / known_weight
+                if known_weight > 0
+                else 0
             )
 
             # Determine traffic light using configured thresholds
@@ -209,46 +409,82 @@ class GitHubOrgHealthCheck:
             print(f"Error processing repository {repo.full_name}: {str(e)}")
             return None
 
+    def list_repositories(self):
+        """Fetch all repositories in the organization, requesting their pages concurrently."""
+        paginated_repos = self.org.get_repos()
+        # The repository count comes from a one-item request, so every page is known up front
+        page_count = -(-paginated_repos.totalCount // self.g.per_page)
+
+        max_workers = self.config["scanning"]["max_workers"]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = executor.map(paginated_repos.get_page, range(page_count))
+            return [repo for page in pages for repo in page]
+
     def scan_organization(self):
         """Scan all repositories in the organization."""
         print(f"Scanning repositories in organization: {self.org.login}")
 
-        repos = list(self.org.get_repos())
+        repos = self.list_repositories()
         print(f"Found {len(repos)} repositories")
 
+        include_archived = self.config["scanning"]["include_archived"]
+        include_private = self.config["scanning"]["include_private"]
+
+        # Score skipped repositories and those with cached health right away, and fetch the rest in batches
         results = []
+        stale_repos = []
+        for repo in repos:
+            skipped = (repo.archived and not include_archived) or (repo.private and not include_private)
+            health = {} if skipped else self._cached_health(repo)
+            if health is None:
+                stale_repos.append(repo)
+                continue
+            result = self.check_single_repo(repo, health)
+            if result:
+                results.append(result)
+        print(f"Fetching health for {len(stale_repos)} repositories")
+
+        batches = [stale_repos[i : i + HEALTH_BATCH_SIZE] for i in range(0, len(stale_repos), HEALTH_BATCH_SIZE)]
         max_workers = self.config["scanning"]["max_workers"]
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.check_single_repo, repo): repo for repo in repos}
+            futures = {executor.submit(self.fetch_repository_health, batch): batch for batch in batches}
+
+            for future in tqdm(concurrent.futures.as_completed(futures), total=len(batches)):
+                health = future.result()
+                for repo in futures[future]:
+                    result = self.check_single_repo(repo, health.get(repo.full_name))
+                    if result:
+                        results.append(result)
 
-            for future in tqdm(concurrent.futures.as_completed(futures), total=len(repos)):
-                result = future.result()
-                if result:
-                    results.append(result)
+        self._save_health_cache()
 
-        df = pd.DataFrame(results)
+        # Repositories skipped by the scanning settings carry no scores
+        scores = [result["overall_score"] for result in results if "overall_score" in result]
 
         summary = {
             "total_repos": len(results),
-            "archived_repos": df["is_archived"].sum(),
-            "private_repos": df["is_private"].sum(),
-            "avg_health_score": df["overall_score"].mean(),
-            "traffic_light_distribution": df["traffic_light"].value_counts().to_dict(),
-            "security_scanning_enabled": df["security_scanning"].sum(),
-            "dependabot_enabled": df["dependabot_enabled"].sum(),
-            "total_critical_alerts": df["dependabot_alerts"].apply(lambda x: x["critical"]).sum(),
-            "total_high_alerts": df["dependabot_alerts"].apply(lambda x: x["high"]).sum(),
+            "archived_repos": sum(result["is_archived"] for result in results),
+            "private_repos": sum(result["is_private"] for result in results),
+            "avg_health_score": sum(scores) / len(scores) if scores else float("nan"),
+            "traffic_light_distribution": dict(
+                Counter(result["traffic_light"] for result in results if "traffic_light" in result).most_common()
+            ),
+            "security_scanning_enabled": sum(result["security_scanning"] for result in results),
+            "dependabot_enabled": sum(result["dependabot_enabled"] is True for result in results),
+            "total_critical_alerts": sum(result["dependabot_alerts"]["critical"] for result in results),
+            "total_high_alerts": sum(result["dependabot_alerts"]["high"] for result in results),
             "scan_date": datetime.now().isoformat(),
         }
 
-        return df, summary
+        return results, summary
 
     def generate_report(self):
         """Generate reports according to configuration."""
         output_dir = self.config["reporting"]["output_directory"]
         os.makedirs(output_dir, exist_ok=True)
 
-        df, summary = self.scan_organization()
+        results, summary = self.scan_organization()
+        scored = [result for result in results if "overall_score" in result]
         reports = []
 
         # Generate configured report formats
@@ -257,7 +493,12 @@ class GitHubOrgHealthCheck:
                 csv_path = os.path.join(
                     output_dir, f"{self.org.login}_repo_health_{datetime.now().strftime('%Y%m%d')}.csv"
                 )
-                df.to_csv(csv_path, index=False)
+                # Columns in order of first appearance, left empty for repositories without them
+                fieldnames = list(dict.fromkeys(key for result in results for key in result))
+                with open(csv_path, "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+                    writer.writeheader()
+                    writer.writerows(results)
                 reports.append(csv_path)
 
             elif format == "markdown":
@@ -287,13 +528,13 @@ class GitHubOrgHealthCheck:
                     # Add top and bottom performers
                     top_n = self.config["reporting"]["include_top_bottom"]
                     f.write(f"\n## Top {top_n} Repositories by Health Score\n")
-                    top = df.nlargest(top_n, "overall_score")[["repository", "overall_score", "traffic_light"]]
-                    for _, row in top.iterrows():
+                    top = heapq.nlargest(top_n, scored, key=lambda result: result["overall_score"])
+                    for row in top:
                         f.write(f"- {row['repository']}: {row['overall_score']:.2f}% ({row['traffic_light']})\n")
 
                     f.write(f"\n## Bottom {top_n} Repositories by Health Score\n")
-                    bottom = df.nsmallest(top_n, "overall_score")[["repository", "overall_score", "traffic_light"]]
-                    for _, row in bottom.iterrows():
+                    bottom = heapq.nsmallest(top_n, scored, key=lambda result: result["overall_score"])
+                    for row in bottom:
                         f.write(f"- {row['repository']}: {row['overall_score']:.2f}% ({row['traffic_light']})\n")
 
                 reports.append(summary_path)
@@ -3,10 +3,20 @@ import sys
 from pathlib import Path
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import List, Dict, Set
 import yaml
 from github import Github, GithubException
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Membership additions and removals issued at once for a single team, kept low for GitHub's secondary rate limits
+MEMBERSHIP_WORKERS = 4
+
 
 def setup_logging():
     """Configure logging for script"""
@@ -21,11 +31,20 @@ def normalize_username(username: str) -> str:
     return username.lstrip("@").strip("'")
 
 
+@lru_cache(maxsize=4096)
+def get_user(gh, username: str):
+    """Get a user for membership changes, which only need the login, so nothing is fetched"""
+    return gh.get_user(username, lazy=True)
+
+
 def get_modified_team_files(repo, base_sha: str, head_sha: str) -> List[str]:
     """Get list of modified teams.yml files between two commits."""
     try:
-        comparison = repo.compare(base_sha, head_sha)
-        modified_files = [file.filename for file in comparison.files]
+        # Only the changed files are needed, so the comparison embeds a single commit rather than a page of them
+        comparison = repo.compare(base_sha, head_sha, comparison_commits_per_page=1)
+        modified_files = {file.filename for file in comparison.files}
+        if not modified_files:
+            return []
 
         all_team_files = get_all_team_files("teams")
 
@@ -46,7 +65,7 @@ def load_team_config(file_path: str) -> Dict:
     """Load team configuration from Yaml file"""
     try:
         with open(file_path, mode="r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
 
         if not isinstance(config.get("teams"), dict):
             raise ValueError(f"Invalid team configuration in {file_path}")
@@ -65,44 +84,62 @@ def get_team_members(team, logger: logging.Logger) -> Set[str]:
         return set()
 
 
-def remove_all_members(team, team_name: str, logger: logging.Logger):
+def apply_membership_changes(gh, team, team_name: str, to_add: Set[str], to_remove: Set[str], logger: logging.Logger):
+    """Add and remove team members concurrently, logging each failure without stopping the rest"""
+
+    def add_member(member):
+        team.add_membership(get_user(gh, member), role="member")
+
+    def remove_member(member):
+        team.remove_membership(get_user(gh, member))
+
+    with ThreadPoolExecutor(max_workers=MEMBERSHIP_WORKERS) as executor:
+        futures = {
+            executor.submit(add_member, member): (f"Added {member} to", f"add {member} to") for member in sorted(to_add)
+        }
+        futures.update(
+            {
+                executor.submit(remove_member, member): (f"Removed {member} from", f"remove {member} from")
+                for member in sorted(to_remove)
+            }
+        )
+        for future in as_completed(futures):
+            done, action = futures[future]
+            try:
+                future.result()
+                logger.info(f"{done} {team_name}")
+            except GithubException as e:
+                logger.error(f"Failed to {action} {team_name}: {e}")
+
+
+def remove_all_members(gh, team, team_name: str, logger: logging.Logger):
     """Remove all members for a team with empty members list in config YAML file."""
     current_members = get_team_members(team, logger)
-    for member in current_members:
-        try:
-            team.remove_membership(member)
-            logger.info(f"Removed {member} from {team_name}")
-        except GithubException as e:
-            logger.error(f"Failed to remove {member} from {team_name}: {e}")
+    apply_membership_changes(gh, team, team_name, set(), current_members, logger)
 
 
 def sync_team_members(gh, team, team_name: str, members_list: List[str], logger: logging.Logger):
     """Sync team members based on the provided list"""
     if members_list is None or not members_list:
         logger.info(f"Empty members list for {team_name} - removing all members")
-        remove_all_members(team, team_name, logger)
+        remove_all_members(gh, team, team_name, logger)
         return
 
     desired_members = {normalize_username(member) for member in members_list}
     current_members = get_team_members(team, logger)
 
-    # Add
-    for member in desired_members - current_members:
-        try:
-            user = gh.get_user(member)
-            team.add_membership(user, role="member")
-            logger.info(f"Added {member} to {team_name}")
-        except GithubException as e:
-            logger.error(f"Failed to add {member} to {team_name}: {e}")
-
-    # Remove
-    for member in current_members - desired_members:
-        try:
-            user = gh.get_user(member)
-            team.remove_membership(user)
-            logger.info(f"Removed {member} from {team_name}")
-        except GithubException as e:
-            logger.error(f"Failed to remove {member} from {team_name}: {e}")
+    apply_membership_changes(
+        gh, team, team_name, desired_members - current_members, current_members - desired_members, logger
+    )
+
+
+@lru_cache(maxsize=None)
+def get_teams_by_slug(org) -> Dict:
+    """Get every team in the organization by slug, listed once per run and shared by all team files
+
+    Slugs are always lowercase, so look teams up with the configured name lowercased, as get_team_by_slug did
+    """
+    return {team.slug: team for team in org.get_teams()}
 
 
 def sync_team_memberships(gh, org, team_config: Dict, logger: logging.Logger):
@@ -111,29 +148,27 @@ def sync_team_memberships(gh, org, team_config: Dict, logger: logging.Logger):
     parent_team_name = team_data["team_name"]
 
     try:
-        try:
-            parent_team = org.get_team_by_slug(parent_team_name)
-            logger.info(f"Found parent team: {parent_team_name}")
-
-            parent_members = team_data.get("members", [])
-            sync_team_members(gh, parent_team, parent_team_name, parent_members, logger)
+        teams_by_slug = get_teams_by_slug(org)
 
-        except GithubException:
+        parent_team = teams_by_slug.get(parent_team_name.lower())
+        if parent_team is None:
             logger.error(f"Parent team {parent_team_name} does not exist in the organization - skipping")
             return
+        logger.info(f"Found parent team: {parent_team_name}")
+
+        parent_members = team_data.get("members", [])
+        sync_team_members(gh, parent_team, parent_team_name, parent_members, logger)
 
         for sub_team_config in team_data.get("default_sub_teams", []):
             sub_team_name = sub_team_config["name"]
-            try:
-                sub_team = org.get_team_by_slug(sub_team_name)
-                logger.info(f"Found sub-team: {sub_team_name}")
-
-                sub_team_members = sub_team_config.get("members", [])
-                sync_team_members(gh, sub_team, sub_team_name, sub_team_members, logger)
-
-            except GithubException:
-                logger.error(f"Sub-team{sub_team_name} does not exist in the organization - skipping")
+            sub_team = teams_by_slug.get(sub_team_name.lower())
+            if sub_team is None:
+                logger.error(f"Sub-team {sub_team_name} does not exist in the organization - skipping")
                 continue
+            logger.info(f"Found sub-team: {sub_team_name}")
+
+            sub_team_members = sub_team_config.get("members", [])
+            sync_team_members(gh, sub_team, sub_team_name, sub_team_members, logger)
 
     except GithubException as e:
         logger.error(f"Failed to sync teams: {e}")
@@ -151,7 +186,7 @@ def main():
     team_directory = "teams"
 
     try:
-        gh = Github(github_token)
+        gh = Github(github_token, per_page=100)
         org = gh.get_organization(org_name)
 
         if os.getenv("GITHUB_EVENT_NAME") == "push" and not os.environ.get("GITHUB_API_EVENT") == "api-push":
@@ -3,11 +3,20 @@ import sys
 from pathlib import Path
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict
 import yaml
 from github import Github, GithubException
 import requests
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Repository access changes issued at once for a single team, kept low for GitHub's secondary rate limits
+REPOSITORY_WORKERS = 4
+
 
 def setup_logging():
     """Configure logging for script"""
@@ -39,8 +48,8 @@ def get_all_team_files(teams_dir: str) -> List[str]:
 def load_team_config(file_path: str) -> Dict:
     """Load team configuration from Yaml file"""
     try:
-        with open(file_path, mode="r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        with open(file_path, mode="rb") as f:
+            config = yaml.load(f, Loader=_YamlLoader)
 
         if not isinstance(config.get("teams"), dict):
             raise ValueError(f"Invalid team configuration in {file_path}")
@@ -83,6 +92,15 @@ def remove_team_repository(
         return False
 
 
+def get_team_permission(repo) -> str:
+    """Get a team's permission on a repository from the team's repository listing, in the API's permission names"""
+    permissions = repo.permissions
+    for permission in ("admin", "maintain", "push", "triage", "pull"):
+        if getattr(permissions, permission, False):
+            return permission
+    return None
+
+
 def sync_team_repos(
     org,
     team,
@@ -107,99 +125,66 @@ def sync_team_repos(
     remove_all_repos = (desired_repos is None) or (len(desired_repos) == 0)
     github_token = os.environ.get("GITHUB_TOKEN")
     try:
-
-        current_team_repos = team.get_repos()
-        current_repos_names = [repo.name for repo in current_team_repos]
+        # The team's repository listing carries its permission on each one, so unchanged repositories cost nothing
+        current_permissions = {repo.name: get_team_permission(repo) for repo in team.get_repos()}
 
         if remove_all_repos:
-            for current_repo in current_team_repos:
-                try:
-                    # Check if repository is in the parent team's repository list
-                    if not is_parent_team and parent_repos and current_repo.name in parent_repos:
-                        logger.warning(
-                            f"Repository {current_repo.name} is being removed from sub-team {team.name}, "
-                            f"but it is still part of the parent team's repository list. "
-                            f"Access to repositories is inherited from parent team. "
-                        )
-                    repo = team.organization.get_repo(current_repo.name)
-                    remove_success = remove_team_repository(
-                        github_token=github_token,
-                        org_name=org.login,
-                        team_slug=team.slug,
-                        repo_name=current_repo.name,
-                        logger=logger,
-                    )
-                    if not remove_success:
-                        try:
-                            team.remove_from_repos(repo)
-                            logger.info(
-                                f"Removed {current_repo.name} from {team.name} using PyGithub method - no repositories configured"
-                            )
-                        except Exception as pygh_error:
-                            logger.error(
-                                f"Failed to remove {current_repo.name} from {team.name} using PyGithub: {pygh_error}"
-                            )
-                except GithubException as e:
-                    logger.error(f"Failed to remove {current_repo.name} from  {team.name}: {e}")
-            return
-
-        # Add/update
-        for repo_name in desired_repos:
+            repos_to_update = []
+            repos_to_remove = set(current_permissions)
+        else:
+            repos_to_update = [
+                repo_name
+                for repo_name in dict.fromkeys(desired_repos)
+                if current_permissions.get(repo_name) != api_permission
+            ]
+            repos_to_remove = set(current_permissions) - set(desired_repos)
+
+        def update_repo(repo_name):
+            """Add a repository to the team or change its permission, addressing it by name"""
             try:
-                repo = org.get_repo(repo_name)
-                # Check if repository already in the team
-                if repo_name not in current_repos_names:
-                    # Add repository to team if not present
-                    try:
-                        team.update_team_repository(repo, api_permission)
-                        logger.info(f"Added {repo_name} to {team.name} with {api_permission} permission")
-                    except GithubException as e:
-                        logger.error(f"Failed to add {repo_name} to {team.name}: {e}")
-                # Check and update permissions if needed
-                try:
-                    # Get current permissions for this team on the repo
-                    team_repo_permission = team.get_repo_permission(repo)
-                    # Compare current permissions with desired permission
-                    if team_repo_permission != api_permission:
-                        # Update team repository permission
-                        team.update_team_repository(repo, api_permission)
-                        logger.info(f"Updated {repo_name} permissions for {team.name} to {api_permission}")
-                except GithubException as perm_error:
-                    logger.error(f"Error checking/updating permissions for {repo_name}: {perm_error}")
-            except GithubException as repo_error:
-                logger.error(f"Error accessing repository {repo_name}: {repo_error}")
-
-        # Remove
-        for current_repo in current_team_repos:
-            if current_repo.name not in desired_repos:
+                updated = team.update_team_repository(f"{org.login}/{repo_name}", api_permission)
+            except GithubException as e:
+                logger.error(f"Error accessing repository {repo_name}: {e}")
+                return
+            if not updated:
+                logger.error(f"Failed to set {api_permission} permission on {repo_name} for {team.name}")
+            elif repo_name in current_permissions:
+                logger.info(f"Updated {repo_name} permissions for {team.name} to {api_permission}")
+            else:
+                logger.info(f"Added {repo_name} to {team.name} with {api_permission} permission")
+
+        def remove_repo(repo_name):
+            """Remove a repository from the team, falling back to PyGithub if the REST call fails"""
+            remove_success = remove_team_repository(
+                github_token=github_token,
+                org_name=org.login,
+                team_slug=team.slug,
+                repo_name=repo_name,
+                logger=logger,
+            )
+            if not remove_success:
                 try:
-                    # Check if repository is in the parent team's repository list
-                    if not is_parent_team and parent_repos and current_repo.name in parent_repos:
-                        logger.warning(
-                            f"Repository {current_repo.name} is being removed from sub-team {team.name}, "
-                            f"but it is still part of the parent team's repository list. "
-                            f"Access to repositories is inherited from parent team. "
-                        )
-                    repo = team.organization.get_repo(current_repo.name)
-                    remove_success = remove_team_repository(
-                        github_token=github_token,
-                        org_name=org.login,
-                        team_slug=team.slug,
-                        repo_name=current_repo.name,
-                        logger=logger,
-                    )
-                    if not remove_success:
-                        try:
-                            team.remove_from_repos(current_repo)
-                            logger.info(
-                                f"Removed {current_repo.name} from {team.name} with permissions: {desired_permissions}"
-                            )
-                        except Exception as pygh_error:
-                            logger.error(
-                                f"Failed to remove {current_repo.name} from {team.name} using PyGithub: {pygh_error}"
-                            )
-                except GithubException as e:
-                    logger.error(f"Failed to remove {current_repo.name} from {team.name}: {e}")
+                    team.remove_from_repos(f"{org.login}/{repo_name}")
+                    logger.info(f"Removed {repo_name} from {team.name} using PyGithub method")
+                except Exception as pygh_error:
+                    logger.error(f"Failed to remove {repo_name} from {team.name} using PyGithub: {pygh_error}")
+
+        inherited_repos = set() if is_parent_team else set(parent_repos or ())
+        for repo_name in sorted(repos_to_remove):
+            # Check if repository is in the parent team's repository list
+            if repo_name in inherited_repos:
+                logger.warning(
+                    f"Repository {repo_name} is being removed from sub-team {team.name}, "
+                    f"but it is still part of the parent team's repository list. "
+                    f"Access to repositories is inherited from parent team. "
+                )
+
+        # Each change reports its own outcome, so one failure does not hold up the rest
+        with ThreadPoolExecutor(max_workers=REPOSITORY_WORKERS) as executor:
+            futures = [executor.submit(update_repo, repo_name) for repo_name in repos_to_update]
+            futures.extend(executor.submit(remove_repo, repo_name) for repo_name in sorted(repos_to_remove))
+            for future in as_completed(futures):
+                future.result()
 
     except GithubException as e:
         logger.error(f"Unexpected error syncing repositories for {team.name}: {e}")
@@ -266,7 +251,7 @@ def main():
     team_directory = "teams"
 
     try:
-        gh = Github(github_token)
+        gh = Github(github_token, per_page=100)
         org = gh.get_organization(org_name)
 
         if os.getenv("GITHUB_EVENT_NAME") == "push" and not os.environ.get("GITHUB_API_EVENT") == "api-push":
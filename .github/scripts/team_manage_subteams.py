@@ -7,6 +7,11 @@ from typing import List, Dict, Set
 import yaml
 from github import Github, GithubException
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def setup_logging():
     """Configure logging for script"""
@@ -36,7 +41,7 @@ def load_team_config(file_path: str) -> Dict:
     """Load and parse team configuration from AML file"""
     try:
         with open(file_path, mode="r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
 
         if not isinstance(config.get("teams"), dict):
             raise ValueError(f"Invalid team configuration in {file_path}")
@@ -123,7 +128,7 @@ def main():
     team_directory = "teams"
 
     try:
-        gh = Github(github_token)
+        gh = Github(github_token, per_page=100)
         org = gh.get_organization(org_name)
 
         if os.getenv("GITHUB_EVENT_NAME") == "push":
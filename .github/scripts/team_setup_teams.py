@@ -5,11 +5,16 @@ from github import Github
 import git
 from git.exc import InvalidGitRepositoryError
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def load_yaml_config(file_path):
     """Load YAML configuration file."""
     with open(file_path, mode="r", encoding="utf-8") as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=_YamlLoader)
 
 
 class IndentDumper(yaml.Dumper):
@@ -172,7 +177,7 @@ def main():
         github_token = os.environ["GITHUB_TOKEN"]
         org_name = os.environ["GITHUB_ORGANIZATION"]
 
-        gh = Github(github_token)
+        gh = Github(github_token, per_page=100)
         org = gh.get_organization(org_name)
 
         # Load configuration
@@ -0,0 +1,116 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+from github import GithubException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.pr_review_manager import PRReviewManager, TEAM_MEMBERS_PAGE_QUERY
+
+
+@pytest.fixture
+def config():
+    return {
+        "pull_requests": {
+            "branches": {
+                "main": {"required_approvals": 1, "required_teams": ["core"], "assignees": ["core"]},
+            }
+        }
+    }
+
+
+@pytest.fixture
+def manager(config):
+    with (
+        patch("scripts.pr_review_manager.Github") as mock_github,
+        patch.object(PRReviewManager, "_load_config", return_value=config),
+    ):
+        mock_github.return_value.get_repo.return_value.full_name = "test-org/test-repo"
+        manager = PRReviewManager("fake-token", "test-org/test-repo", 1)
+    manager.org.login = "test-org"
+    return manager
+
+
+def members_page(logins, cursor=None):
+    return {
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+        "nodes": [{"login": login, "id": f"id-{login}"} for login in logins],
+    }
+
+
+@pytest.fixture
+def pull_request_data():
+    return {
+        "repository": {
+            "pullRequest": {
+                "id": "PR_1",
+                "baseRefName": "main",
+                "headRefOid": "abc123",
+                "author": {"login": "author"},
+                "commits": {"nodes": [{"commit": {"status": {"context": {"state": "PENDING"}}}}]},
+                "latestOpinionatedReviews": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    "nodes": [
+                        {"state": "APPROVED", "author": {"login": "user1"}},
+                        {"state": "CHANGES_REQUESTED", "author": {"login": "user2"}},
+                        {"state": "APPROVED", "author": None},
+                    ],
+                },
+            }
+        },
+        "organization": {"t0": {"slug": "core", "members": members_page(["user1", "user3"])}},
+    }
+
+
+def test_graphql_raises_without_data(manager):
+    manager.gh._Github__requester.requestJsonAndCheck.return_value = ({}, {"errors": [{"message": "Bad query"}]})
+
+    with pytest.raises(GithubException):
+        manager._graphql("query { viewer { login } }", {})
+
+
+def test_get_pull_request_context(manager, pull_request_data):
+    manager._graphql = MagicMock(return_value=pull_request_data)
+
+    context = manager._get_pull_request_context(1, manager.org, ["core", "core"])
+
+    assert context["node_id"] == "PR_1"
+    assert context["base_ref"] == "main"
+    assert context["head_sha"] == "abc123"
+    assert context["author"] == "author"
+    assert context["status"] == {"state": "PENDING"}
+    assert context["review_states"] == {"user1": "APPROVED", "user2": "CHANGES_REQUESTED"}
+    assert context["reviews_cursor"] is None
+    assert manager._team_to_members == {"core": {"user1", "user3"}}
+    assert manager._user_ids == {"user1": "id-user1", "user3": "id-user3"}
+
+
+def test_parse_team_members_follows_pages(manager):
+    data = {"organization": {"t0": {"slug": "core", "members": members_page(["user1"], cursor="page-2")}}}
+    manager._graphql = MagicMock(
+        return_value={"organization": {"team": {"members": members_page(["user2"])}}},
+    )
+
+    team_members = manager._parse_team_members(data, ["core"], manager.org)
+
+    assert team_members == {"core": {"user1", "user2"}}
+    manager._graphql.assert_called_once_with(
+        TEAM_MEMBERS_PAGE_QUERY, {"org": "test-org", "slug": "core", "after": "page-2"}
+    )
+
+
+def test_parse_team_members_missing_team(manager):
+    team_members = manager._parse_team_members({"organization": {"t0": None}}, ["missing"], manager.org)
+
+    assert team_members == {"missing": set()}
+
+
+def test_check_required_reviews(manager, pull_request_data, config):
+    manager._graphql = MagicMock(return_value=pull_request_data)
+    branch_config = config["pull_requests"]["branches"]["main"]
+
+    context = manager._get_pull_request_context(1, manager.org, ["core"])
+    assert manager._check_required_reviews(context, branch_config, ["core"])
+
+    context["review_states"] = {"user2": "APPROVED"}
+    assert not manager._check_required_reviews(context, branch_config, ["core"])
@@ -0,0 +1,121 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+
+# Add script directory to Python path, the script imports its helpers as top-level modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from scripts import repo_configuration_management
+from scripts.repo_configuration_management import RepositoryConfigManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(repo_configuration_management, "CONFIG_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(repo_configuration_management, "REPOSITORY_STATE_FILE", str(tmp_path / "state.json"))
+    with (
+        patch("scripts.repo_configuration_management.get_github"),
+        patch("scripts.repo_configuration_management.get_organization"),
+    ):
+        return RepositoryConfigManager("fake-token", "test-org")
+
+
+@pytest.fixture
+def repository():
+    return {
+        "name": "test-repo",
+        "nameWithOwner": "test-org/test-repo",
+        "description": "Old description",
+        "isPrivate": True,
+        "defaultBranchRef": {
+            "name": "main",
+            "branchProtectionRule": {
+                "requiresStatusChecks": True,
+                "requiresStrictStatusChecks": False,
+                "requiredStatusCheckContexts": ["ci"],
+                "isAdminEnforced": False,
+                "requiresApprovingReviews": True,
+                "requiredApprovingReviewCount": 1,
+                "dismissesStaleReviews": False,
+                "requiresCodeOwnerReviews": False,
+            },
+        },
+        "config": {
+            "oid": "blob-sha",
+            "text": (
+                "metadata:\n"
+                "  description: New description\n"
+                "  private: true\n"
+                "branch_protection:\n"
+                "  enforce_admins: true\n"
+                "  required_status_checks: [ci]\n"
+                "collaborators: [user1, user2]\n"
+            ),
+        },
+        "collaborators": {"pageInfo": {"hasNextPage": False}, "nodes": [{"login": "user1"}, {"login": "user3"}]},
+    }
+
+
+def test_iter_repositories_follows_pages(manager):
+    manager._graphql = MagicMock(
+        side_effect=[
+            {
+                "organization": {
+                    "repositories": {"pageInfo": {"hasNextPage": True, "endCursor": "page-2"}, "nodes": [{"name": "a"}]}
+                }
+            },
+            {
+                "organization": {
+                    "repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "b"}]}
+                }
+            },
+        ]
+    )
+
+    assert [repo["name"] for repo in manager.iter_repositories()] == ["a", "b"]
+    assert manager._graphql.call_args.args[1]["cursor"] == "page-2"
+
+
+def test_validate_repository_config(manager, repository):
+    changes = manager.validate_repository_config(repository)
+
+    assert changes["description"] == "New description"
+    assert "private" not in changes
+    assert changes["branch_protection"]["enforce_admins"] is True
+    assert "required_status_checks" not in changes["branch_protection"]
+    assert changes["collaborators"] == {"add": ["user2"], "remove": ["user3"]}
+
+
+def test_validate_repository_config_without_config(manager, repository):
+    repository["config"] = None
+
+    assert manager.validate_repository_config(repository) is None
+
+
+def test_process_repository_skips_unchanged_repository(manager, repository):
+    manager._previous_state = {"test-org/test-repo": manager._repository_digest(repository)}
+    manager.validate_repository_config = MagicMock()
+
+    manager.process_repository(repository)
+
+    manager.validate_repository_config.assert_not_called()
+    assert manager._repository_state == manager._previous_state
+
+
+def test_process_repository_records_repository_in_line(manager, repository):
+    repository["config"]["text"] = "metadata:\n  description: Old description\n"
+
+    manager.process_repository(repository)
+
+    assert manager._repository_state == {"test-org/test-repo": manager._repository_digest(repository)}
+
+
+def test_process_repository_without_collaborators(manager, repository):
+    repository["collaborators"] = None
+    repository["config"]["text"] = "metadata:\n  description: Old description\n"
+
+    manager.process_repository(repository)
+
+    assert not manager._repository_state
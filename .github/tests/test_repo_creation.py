@@ -0,0 +1,162 @@
+import os
+import sys
+import random
+import logging
+from unittest.mock import MagicMock, patch
+import pytest
+
+# Add script directory to Python path, the script imports its helpers as top-level modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+# The script logs to a file in the working directory, which the tests leave out
+with patch("logging.FileHandler", return_value=logging.NullHandler()):
+    from scripts.repo_creation import RepositoryCreationHandler, REPOSITORY_SETTINGS_PATH
+
+
+@pytest.fixture
+def mock_org():
+    return MagicMock()
+
+
+@pytest.fixture
+def handler(mock_org):
+    with (
+        patch("scripts.repo_creation.get_github"),
+        patch("scripts.repo_creation.get_organization", return_value=mock_org),
+    ):
+        return RepositoryCreationHandler("fake-token", "test-org")
+
+
+@pytest.fixture
+def issue_body():
+    return (
+        "## Repository Creation Request\n"
+        "Repository Name:\n"
+        "my-repo\n"
+        "Repository Description:\n"
+        "A repository for testing\n"
+        "Repository Visibility:\n"
+        "private\n"
+        "Branch Protection Settings:\n"
+        "- [x] Enforce for administrators\n"
+        "- [ ] Require status checks before merging\n"
+        "Teams (Optional):\n"
+        "team-a\n"
+        "team-b\n"
+    )
+
+
+def test_parse_issue_body(handler, issue_body):
+    input_data = handler.parse_issue_body(issue_body)
+
+    assert input_data == {
+        "required": {"repo_name": "my-repo", "description": "A repository for testing", "visibility": "private"},
+        "optional": {"teams": "team-a\nteam-b"},
+        "branch_protection": ["Enforce for administrators"],
+    }
+
+
+def test_parse_issue_form_body(handler):
+    body = (
+        "### Repository Name\n\n"
+        "my-repo\n\n"
+        "### Repository Description\n\n"
+        "A repository for testing\n\n"
+        "### Repository Visibility\n\n"
+        "Private (Recommended)\n\n"
+        "### Branch Protection Settings\n\n"
+        "- [X] Enforce for administrators\n"
+        "- [ ] Require status checks before merging\n"
+        "- [X] Require 1 pull request review before merging\n\n"
+        "### Teams (Optional)\n\n"
+        "team-a\n"
+        "team-b\n\n"
+        "### Additional Notes (Optional)\n\n"
+        "_No response_"
+    )
+
+    input_data = handler.parse_issue_body(body)
+
+    assert input_data == {
+        "required": {"repo_name": "my-repo", "description": "A repository for testing", "visibility": "Private"},
+        "optional": {"teams": "team-a\nteam-b"},
+        "branch_protection": ["Enforce for administrators", "Require 1 pull request review before merging"],
+    }
+    assert handler.validate_visibility(input_data["required"]["visibility"])[0]
+
+
+def test_create_repository_from_issue_body(handler, mock_org, issue_body):
+    repo = mock_org.create_repo.return_value
+    repo.name = "my-repo"
+
+    config = handler.generate_repository_config(handler.parse_issue_body(issue_body))
+    with patch("scripts.repo_creation.save_repository_config") as mock_save:
+        assert handler.create_repository(config) is repo
+
+    mock_org.create_repo.assert_called_once_with(
+        name="my-repo", description="A repository for testing", visibility="private", auto_init=False
+    )
+    repo_config = mock_save.call_args.args[1]
+    assert repo_config["metadata"]["name"] == "my-repo"
+    repo.create_file.assert_called_once()
+    assert repo.create_file.call_args.args[0] == REPOSITORY_SETTINGS_PATH
+
+
+def test_parse_issue_body_skips_indented_headings(handler):
+    input_data = handler.parse_issue_body("Repository Name:\nfoo\n  ## Section:\nbaz")
+
+    assert input_data["required"] == {"repo_name": "foo\nbaz"}
+
+
+def parse_issue_body_by_line(handler, body):
+    """The line-by-line parser the issue form pattern replaced, kept as a reference for the pattern."""
+    input_data = {"required": {}, "optional": {}, "branch_protection": []}
+    current_section = None
+    current_data = []
+    for line in body.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("##"):
+            continue
+        if line.endswith(":"):
+            if current_section and current_data:
+                handler._process_section(current_section, current_data, input_data)
+            current_section = line.replace(":", "").replace(" (Optional)", "").lower()
+            current_data = []
+        elif line.startswith("- [x]"):
+            if current_section == "branch protection settings":
+                input_data["branch_protection"].append(line[5:].strip())
+        elif not line.startswith("-"):
+            current_data.append(line)
+    if current_section and current_data:
+        handler._process_section(current_section, current_data, input_data)
+    return input_data
+
+
+def test_parse_issue_body_matches_line_parser(handler):
+    fragments = [
+        "Repository Name:",
+        "Repository Description:",
+        "Repository Visibility:",
+        "Teams (Optional):",
+        "Branch Protection Settings:",
+        "## Section:",
+        " ## Heading",
+        "- [x] Enforce for administrators",
+        "- [x]",
+        "- [ ] Require status checks",
+        "- item",
+        "> quoted",
+        "a:b",
+        ":",
+        "my-repo",
+        "team a",
+        "",
+    ]
+    rng = random.Random(0)
+    for _ in range(2000):
+        body = "\n".join(
+            rng.choice(["", " ", "\t"]) + rng.choice(fragments) + rng.choice(["", " ", "\r"])
+            for _ in range(rng.randint(0, 10))
+        )
+        assert handler.parse_issue_body(body) == parse_issue_body_by_line(handler, body), body
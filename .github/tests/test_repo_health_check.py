@@ -0,0 +1,137 @@
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+import pytest
+
+pytest.importorskip("tqdm")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts import repo_health_check
+from scripts.repo_health_check import ConfigManager, GitHubOrgHealthCheck
+
+
+@pytest.fixture
+def health_check(tmp_path, monkeypatch):
+    monkeypatch.setattr(repo_health_check, "HEALTH_CACHE_DIR", str(tmp_path))
+    with patch("scripts.repo_health_check.Github"):
+        return GitHubOrgHealthCheck("fake-token", "test-org", config_path=str(tmp_path / "config.yaml"))
+
+
+@pytest.fixture
+def repo():
+    repo = MagicMock(full_name="test-org/test-repo", archived=False, private=False)
+    repo.updated_at = datetime(2024, 1, 1)
+    repo.security_and_analysis.advanced_security.status = "enabled"
+    return repo
+
+
+@pytest.fixture
+def health():
+    return {
+        "root": {
+            "entries": [
+                {"name": "README.MD"},
+                {"name": "CODEOWNERS"},
+                {"name": "SECURITY.md"},
+                {"name": "CODE_OF_CONDUCT.md"},
+                {"name": ".gitignore"},
+            ]
+        },
+        "github": {"entries": [{"name": "pull_request_template.md"}]},
+        "dependabot": {
+            "hasVulnerabilityAlertsEnabled": True,
+            "vulnerabilityAlerts": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [
+                    {"securityVulnerability": {"severity": "HIGH"}},
+                    {"securityVulnerability": {"severity": "MODERATE"}},
+                ],
+            },
+        },
+    }
+
+
+def test_check_single_repo(health_check, repo, health):
+    metrics = health_check.check_single_repo(repo, health)
+
+    assert metrics["required_files"]["README.md"] is True
+    assert metrics["required_files"]["pull_request_template.md"] is True
+    assert metrics["required_files"]["GOVERNANCE.md"] is False
+    assert metrics["required_files_score"] == pytest.approx(100)
+    assert metrics["security_scanning"] is True
+    assert metrics["dependabot_enabled"] is True
+    assert metrics["dependabot_alerts"] == {"critical": 0, "high": 1, "medium": 1, "low": 0}
+    assert metrics["alert_score"] == pytest.approx(87.5)
+    assert metrics["overall_score"] == pytest.approx(96.25)
+    assert metrics["traffic_light"] == "GREEN"
+
+
+def test_check_single_repo_without_security_settings(health_check, repo, health):
+    repo.security_and_analysis = None
+
+    metrics = health_check.check_single_repo(repo, health)
+
+    assert metrics["security_scanning"] is False
+    assert metrics["traffic_light"] == "AMBER"
+
+
+def test_check_single_repo_unknown_dependabot(health_check, repo, health):
+    health["dependabot"] = None
+
+    metrics = health_check.check_single_repo(repo, health)
+
+    assert metrics["dependabot_enabled"] is None
+    assert metrics["alert_score"] is None
+    assert metrics["overall_score"] == pytest.approx(100)
+    assert metrics["traffic_light"] == "GREEN"
+
+
+def test_fetch_repository_health_pages_alerts(health_check, repo, health):
+    repo.name = "test-repo"
+    repo.pushed_at = None
+    first_page = health["dependabot"]["vulnerabilityAlerts"]
+    first_page["pageInfo"] = {"hasNextPage": True, "endCursor": "page-2"}
+    health_check._graphql = MagicMock(
+        side_effect=[
+            {"r0": {"root": health["root"], "github": health["github"]}, "d0": health["dependabot"]},
+            {
+                "repository": {
+                    "vulnerabilityAlerts": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "nodes": [{"securityVulnerability": {"severity": "CRITICAL"}}],
+                    }
+                }
+            },
+        ]
+    )
+
+    node = health_check.fetch_repository_health([repo])["test-org/test-repo"]
+
+    assert len(node["dependabot"]["vulnerabilityAlerts"]["nodes"]) == 3
+    assert health_check._graphql.call_args.args[1] == {"owner": "test-org", "name": "test-repo", "after": "page-2"}
+    assert health_check.check_single_repo(repo, node)["dependabot_alerts"]["critical"] == 1
+
+
+def test_check_single_repo_unknown_health(health_check, repo):
+    metrics = health_check.check_single_repo(repo, None)
+
+    assert metrics["traffic_light"] == "UNKNOWN"
+    assert "overall_score" not in metrics
+
+
+def test_check_single_repo_skips_archived(health_check, repo):
+    repo.archived = True
+
+    metrics = health_check.check_single_repo(repo, {})
+
+    assert metrics["is_archived"] is True
+    assert "traffic_light" not in metrics
+
+
+def test_config_manager_returns_copies(tmp_path):
+    config_path = str(tmp_path / "config.yaml")
+    config = ConfigManager(config_path).config
+    config["scoring"]["thresholds"]["green"] = 0
+
+    assert ConfigManager(config_path).config["scoring"]["thresholds"]["green"] == 80
@@ -173,6 +173,20 @@ def test_sync_team_members_add_remove(mock_github, mock_team, mock_logger):
     mock_team.remove_membership.assert_called_once()
 
 
+def test_sync_team_members_reuses_users(mock_github, mock_logger):
+    first_team = MagicMock()
+    first_team.get_members.return_value = []
+    second_team = MagicMock()
+    second_team.get_members.return_value = []
+
+    sync_team_members(mock_github, first_team, "first-team", ["shared_user"], mock_logger)
+    sync_team_members(mock_github, second_team, "second-team", ["@shared_user"], mock_logger)
+
+    mock_github.get_user.assert_called_once_with("shared_user", lazy=True)
+    first_team.add_membership.assert_called_once()
+    second_team.add_membership.assert_called_once()
+
+
 def test_sync_team_members_empty_list(mock_github, mock_team, mock_logger):
     current_member = MagicMock()
     current_member.login = "existing_user"
@@ -199,32 +213,67 @@ def test_sync_team_memberships(mock_github, mock_logger, sample_team_config):
     mock_sub_team_2.per_page = 100
     mock_sub_team_2.timeout = 10
 
-    mock_org.get_team_by_slug.side_effect = [mock_parent_team, mock_sub_team_1, mock_sub_team_2]
+    mock_parent_team.slug = "engineering"
+    mock_sub_team_1.slug = "backend"
+    mock_sub_team_2.slug = "frontend"
+    mock_org.get_teams.return_value = [mock_parent_team, mock_sub_team_1, mock_sub_team_2]
 
     sync_team_memberships(mock_github, mock_org, sample_team_config, mock_logger)
 
-    # Verify parent team was synced
-    assert mock_org.get_team_by_slug.call_count >= 1
+    # Verify teams were listed once and every team was synced
+    mock_org.get_teams.assert_called_once()
+    mock_org.get_team_by_slug.assert_not_called()
     mock_parent_team.get_members.assert_called_once()
+    mock_sub_team_1.get_members.assert_called_once()
+    mock_sub_team_2.get_members.assert_called_once()
+
+    # Later team files reuse the same listing
+    sync_team_memberships(mock_github, mock_org, sample_team_config, mock_logger)
+    mock_org.get_teams.assert_called_once()
+
+
+def test_sync_team_memberships_mixed_case_names(mock_github, mock_logger):
+    team_config = {
+        "teams": {
+            "team_name": "Team-Test-Creation-A",
+            "members": ["user1"],
+            "default_sub_teams": [{"name": "Team-Test-Creation-A-developers", "members": ["user2"]}],
+        }
+    }
+    mock_org = MagicMock()
+    mock_parent_team = MagicMock()
+    mock_parent_team.slug = "team-test-creation-a"
+    mock_sub_team = MagicMock()
+    mock_sub_team.slug = "team-test-creation-a-developers"
+    mock_org.get_teams.return_value = [mock_parent_team, mock_sub_team]
+
+    sync_team_memberships(mock_github, mock_org, team_config, mock_logger)
+
+    # Teams configured by name are found under their lowercase slugs
+    mock_parent_team.get_members.assert_called_once()
+    mock_sub_team.get_members.assert_called_once()
 
 
 def test_sync_team_memberships_parent_team_not_found(mock_github, mock_logger, sample_team_config):
     mock_org = MagicMock()
-    mock_org.get_team_by_slug.side_effect = GithubException(404, "Not found")
+    mock_sub_team = MagicMock()
+    mock_sub_team.slug = "backend"
+    mock_org.get_teams.return_value = [mock_sub_team]
 
     sync_team_memberships(mock_github, mock_org, sample_team_config, mock_logger)
-    mock_org.get_team_by_slug.assert_called_once()
+    mock_org.get_teams.assert_called_once()
+    mock_sub_team.get_members.assert_not_called()
 
 
 # Error handling and edge case tests
 def test_sync_team_members_github_exception(mock_github, mock_team, mock_logger, caplog):
-    # Simulate GitHub user lookup failure
-    def side_effect(username):
-        if username == "non_existent_user":
+    # Simulate GitHub rejecting the membership of a non-existent user
+    def side_effect(user, role=None):
+        if user.login == "non_existent_user":
             raise GithubException(404, "User not found")
-        return MagicMock()  # Return a mock user for valid usernames
 
-    mock_github.get_user.side_effect = side_effect
+    mock_github.get_user.side_effect = lambda username, lazy=False: MagicMock(login=username)
+    mock_team.add_membership.side_effect = side_effect
     mock_team.get_members.return_value = []
 
     # Capture log messages
@@ -236,8 +285,8 @@ def test_sync_team_members_github_exception(mock_github, mock_team, mock_logger,
     # Assert that an error was logged
     assert any("Failed to add non_existent_user to test-team" in record.message for record in caplog.records)
 
-    # Verify no membership operations were performed
-    mock_team.add_membership.assert_not_called()
+    # Verify the user was looked up without fetching it, and nothing was removed
+    mock_github.get_user.assert_called_once_with("non_existent_user", lazy=True)
     mock_team.remove_membership.assert_not_called()
 
 
@@ -66,34 +66,68 @@ def temp_config_file(tmp_path, sample_team_config):
     return str(config_file)
 
 
+def team_repo(name, permission):
+    """Repository as listed for a team, with the team's permission on it"""
+    repo = MagicMock()
+    repo.name = name
+    for level in ("admin", "maintain", "push", "triage", "pull"):
+        setattr(repo.permissions, level, level == permission)
+    return repo
+
+
 def test_sync_team_repos_add_new_repo(mock_org, mock_team, mock_logger):
     # Setup
     desired_repos = ["new-repo"]
     mock_team.get_repos.return_value = []
-    mock_repo = MagicMock()
-    mock_org.get_repo.return_value = mock_repo
 
     # Test
     sync_team_repos(mock_org, mock_team, desired_repos, "write", mock_logger)
 
     # Verify
-    mock_team.update_team_repository.assert_called_with(mock_repo, "push")
-    mock_logger.info.assert_called_with(f"Updated new-repo permissions for {mock_team.name} to push")
+    mock_team.update_team_repository.assert_called_once_with("test-org/new-repo", "push")
+    mock_logger.info.assert_called_with(f"Added new-repo to {mock_team.name} with push permission")
+    mock_org.get_repo.assert_not_called()
 
 
 def test_sync_team_repos_update_permissions(mock_org, mock_team, mock_logger):
     # Setup
     desired_repos = ["existing-repo"]
-    mock_repo = MagicMock(name="existing-repo")
-    mock_team.get_repos.return_value = [mock_repo]
-    mock_team.get_repo_permission.return_value = "pull"
-    mock_org.get_repo.return_value = mock_repo
+    mock_team.get_repos.return_value = [team_repo("existing-repo", "pull")]
 
     # Test
     sync_team_repos(mock_org, mock_team, desired_repos, "write", mock_logger)
 
     # Verify
-    mock_team.update_team_repository.assert_called_with(mock_repo, "push")
+    mock_team.update_team_repository.assert_called_once_with("test-org/existing-repo", "push")
+    mock_logger.info.assert_called_with(f"Updated existing-repo permissions for {mock_team.name} to push")
+
+
+def test_sync_team_repos_unchanged(mock_org, mock_team, mock_logger):
+    # Setup
+    mock_team.get_repos.return_value = [team_repo("existing-repo", "push")]
+
+    # Test
+    with patch("scripts.team_manage_resource.remove_team_repository") as mock_remove:
+        sync_team_repos(mock_org, mock_team, ["existing-repo"], "write", mock_logger)
+
+    # Verify no requests beyond the listing
+    mock_team.update_team_repository.assert_not_called()
+    mock_team.get_repo_permission.assert_not_called()
+    mock_remove.assert_not_called()
+
+
+def test_sync_team_repos_remove_repo(mock_org, mock_team, mock_logger):
+    # Setup
+    mock_team.get_repos.return_value = [team_repo("kept-repo", "push"), team_repo("old-repo", "push")]
+
+    # Test
+    with patch("scripts.team_manage_resource.remove_team_repository", return_value=True) as mock_remove:
+        sync_team_repos(mock_org, mock_team, ["kept-repo"], "write", mock_logger)
+
+    # Verify
+    mock_remove.assert_called_once()
+    assert mock_remove.call_args.kwargs["repo_name"] == "old-repo"
+    mock_team.remove_from_repos.assert_not_called()
 
 
 def test_sync_team_repos_github_exception(mock_org, mock_team, mock_logger):